@@ -0,0 +1,47 @@
+import pygame
+
+
+class AssetCache():
+    """Images and masks shared by the whole game, every file is decoded and every mask is built only once."""
+
+    # path -> converted image and path -> its mask. they are shared, so nothing may draw on them or change them
+    _images = {}
+    _masks = {}
+    # (color, width) -> circle drawn over the board circles, shared the same way
+    _highlights = {}
+    highlight_size = 75
+    # path -> how many times the image was decoded from disk, and how many times its mask was built
+    load_counts = {}
+    mask_counts = {}
+
+    @classmethod
+    def image(cls, path):
+        """Returns the shared image of the file. Its only for reading, image_copy is for drawing on."""
+        if path not in cls._images:
+            cls._images[path] = pygame.image.load(path).convert_alpha()
+            cls.load_counts[path] = cls.load_counts.get(path, 0) + 1
+        return cls._images[path]
+
+    @classmethod
+    def image_copy(cls, path):
+        """Returns own copy of the image, which can be drawn on."""
+        return cls.image(path).copy()
+
+    @classmethod
+    def mask(cls, path):
+        """Returns the shared mask of the image."""
+        if path not in cls._masks:
+            cls._masks[path] = pygame.mask.from_surface(cls.image(path))
+            cls.mask_counts[path] = cls.mask_counts.get(path, 0) + 1
+        return cls._masks[path]
+
+    @classmethod
+    def highlight(cls, color, width=0):
+        """Returns the shared transparent surface with a circle of the board circles size, filled when width is 0."""
+        key = (tuple(color), width)
+        if key not in cls._highlights:
+            size = cls.highlight_size
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, (size // 2, size // 2), size // 2, width)
+            cls._highlights[key] = surface
+        return cls._highlights[key]
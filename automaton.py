@@ -1,9 +1,20 @@
+import hashlib
+import time
 import pygame
 
+from simulation_reduction import CheckerStats, reduce_nfa
+from telemetry import telemetry
+
 
 class Automaton():
     """Automaton with initial, accepting states and transition function."""
 
+    __slots__ = ("_is_nondeterministic", "_alphabet", "_current_states", "_initial_states",
+                 "_accepting_states", "_transition_dict", "_new_transition", "_analysis")
+
+    # shared by all automata, collects sizes and times of the checks
+    checker_stats = CheckerStats()
+
     def __init__(self, nondeterministic):
         """Initialises a blank deterministic or nondeterministic automaton."""
         self._is_nondeterministic = nondeterministic
@@ -14,6 +25,8 @@ class Automaton():
         # stores connections of circles and arrows, e.g. from 1 via x to 3
         self._transition_dict = {}
         self._new_transition = [None, None, None] # circle_from, arrow, circle_to
+        # analysis of dead and unreachable states, created when first needed
+        self._analysis = None
 
     @property
     def initial_states(self):
@@ -22,6 +35,7 @@ class Automaton():
     @initial_states.setter
     def initial_states(self, value):
         self._initial_states = value
+        self._invalidate_analysis()
 
     @property
     def accepting_states(self):
@@ -30,6 +44,7 @@ class Automaton():
     @accepting_states.setter
     def accepting_states(self, value):
         self._accepting_states = value
+        self._invalidate_analysis()
 
     @property
     def transition_dict(self):
@@ -38,6 +53,22 @@ class Automaton():
     @transition_dict.setter
     def transition_dict(self, value):
         self._transition_dict = value
+        self._invalidate_analysis()
+
+    @property
+    def analysis(self):
+        """Analysis of reachable and dead states, kept up to date with changes of the automaton."""
+        if not self._analysis:
+            # initialising here, to avoid circular import
+            from state_analysis import StateAnalysis
+
+            self._analysis = StateAnalysis(self)
+        return self._analysis
+
+    def _invalidate_analysis(self):
+        """Something was removed from the automaton, analysis has to be recomputed when needed."""
+        if self._analysis:
+            self._analysis.invalidate()
 
     @property
     def circle_from(self):
@@ -66,21 +97,26 @@ class Automaton():
     def add_initial_state(self, state):
         if state not in self._initial_states:
             self._initial_states.append(state)
+            if self._analysis:
+                self._analysis.initial_state_added(state)
 
     def remove_initial_state(self, state):
         self._initial_states.remove(state)
+        self._invalidate_analysis()
 
     def add_accepting_state(self, state):
         if state not in self._accepting_states:
             self._accepting_states.append(state)
+            if self._analysis:
+                self._analysis.accepting_state_added(state)
 
     def remove_accepting_state(self, state):
         self._accepting_states.remove(state)
+        self._invalidate_analysis()
 
     def handle_new_transition(self, player_group, circle_group):
         """Handles creating a new transition and setting correct initial and or accepting states of automaton."""
-        circles = pygame.sprite.spritecollide(
-            player_group.sprite, circle_group, False, pygame.sprite.collide_mask)
+        circles = circle_group.collide(player_group.sprite)
 
         # adding circle from -> making sure its clear which circle player wants to make transition from
         if len(circles) == 1 and (not self._new_transition[0]):
@@ -96,6 +132,10 @@ class Automaton():
             self._handle_previous_circle_variants(circles[0])
             self._add_new_transition_to_dict()
 
+    def cancel_new_transition(self):
+        """Forgets the transition in process of creation."""
+        self._new_transition = [None, None, None]
+
     def _handle_previous_circle_variants(self, circle):
         """Adding initial and or accepting state according to the variant of the circle."""
         circle_variant = circle.variant
@@ -119,8 +159,7 @@ class Automaton():
 
     def _fetch_circle_from_to(self, arrow, circle_group):
         """Returns circle_from and circle_to depending on what point of arrow circle collides with."""
-        arrow_circles = pygame.sprite.spritecollide(
-            arrow, circle_group, False, pygame.sprite.collide_mask)
+        arrow_circles = circle_group.collide(arrow)
 
         # if player wants to add symbol to arrow, when its not yet attached to circle, it can cause errors due to circle_to variable not being assigned value
         circle_to = None
@@ -177,8 +216,12 @@ class Automaton():
             if circle_to_num == transition[1]:
                 if new_symbol in transition[0]:
                     transition[0].remove(new_symbol)
+                    self._invalidate_analysis()
                 elif new_symbol not in transition[0]:
                     transition[0].append(new_symbol)
+                    # transition can be taken only once it has a symbol
+                    if self._analysis and len(transition[0]) == 1:
+                        self._analysis.edge_added(circle_from_num, circle_to_num)
 
     def handle_delete_transition_entirely(self, arrow, circle_group):
         """Finds transition to be entirely deleted from transition_dict."""
@@ -196,26 +239,55 @@ class Automaton():
             # if no outgoing transitions transitions remain from the state, delete the key
             if not transitions:
                 self._transition_dict.pop(circle_from.number, None)
+            self._invalidate_analysis()
 
             # if in process of creation, reset, so new arrow can be created from scratch
             self._new_transition = [None, None, None]
 
-    def handle_checking_language(self, level_automaton):
-        """Checks whether there are errors in user automaton, and if it is equivalent to level automaton."""
+    def handle_checking_language(self, level_automaton, level_goal=None, level_suite=None):
+        """Checks whether there are errors in user automaton, and if it is equivalent to level automaton or meets the level goal."""
         errors = self._handle_errors()
         if errors:
             return errors
 
+        # levels with a goal are checked on the lazy product of all their automata
+        if level_goal:
+            start = time.perf_counter()
+            verdict = level_goal.check(self)
+            telemetry.emit("checker", stage="goal", seconds=time.perf_counter() - start)
+            return verdict
+
+        # most wrong automata fail some word of the precomputed suite, the full check runs only if the suite passes
+        if level_suite:
+            start = time.perf_counter()
+            counter_example = level_suite.find_counter_example(self)
+            telemetry.emit("checker", stage="suite", seconds=time.perf_counter() - start,
+                           suite_size=level_suite.size, failed=bool(counter_example))
+            if counter_example:
+                return counter_example
+
         # initialising here, to avoid circular import
         from product_automaton import ProductAutomaton
 
+        # states that are unreachable or can never accept dont change the language, they only make the search bigger
+        check_start = time.perf_counter()
+        player_automaton = self.trimmed()
+        reduction_fields = {}
         if self._is_nondeterministic:
-            player_automaton = self.determinise_nfa()
-        else:
-            player_automaton = self
+            # merging and pruning simulated states first, determinisation is exponential in the number of states
+            player_automaton = reduce_nfa(player_automaton, self.checker_stats)
+            start = time.perf_counter()
+            player_automaton = player_automaton.determinise_nfa()
+            determinisation_seconds = time.perf_counter() - start
+            self.checker_stats.determinisation_seconds += determinisation_seconds
+            reduction_fields = dict(self.checker_stats.last_reduction, determinisation_seconds=determinisation_seconds,
+                                    dfa_states=len(player_automaton._collect_states()))
 
         product_automaton = ProductAutomaton(player_automaton, level_automaton)
-        return product_automaton.check_languages_equivalent()
+        verdict = product_automaton.check_languages_equivalent()
+        telemetry.emit("checker", stage="product", seconds=time.perf_counter() - check_start,
+                       nondeterministic=bool(self._is_nondeterministic), **reduction_fields)
+        return verdict
 
     def _handle_errors(self):
         """Checking for errors in user automaton."""
@@ -235,7 +307,7 @@ class Automaton():
         """Determinises user automaton by using subset construction."""
         # user automaton is converted every time when they want to check if languages are equivalent. player_a in automaton class can be then modified by user again. didnt want to convert already converted automaton
         # list and set cannot be used as dictionary keys
-        new_initial_states = [tuple(self._initial_states)]
+        new_initial_states = [tuple(sorted(set(self._initial_states)))]
         new_accepting_states = [tuple(self._accepting_states)]
         for state in new_initial_states:
             if set(self._accepting_states).intersection(set(state)):
@@ -262,7 +334,8 @@ class Automaton():
                     result = self._transition_function(current_state, symbol)
                     current_new_states = result if result != [-1] else []
                     new_states.extend(current_new_states)
-                new_states = tuple(new_states)
+                # sorted without duplicates, so the same subset is always the same tuple and the search terminates
+                new_states = tuple(sorted(set(new_states)))
 
                 # add the new states to dictionary and queue to be examined
                 if new_states:
@@ -295,4 +368,45 @@ class Automaton():
                 result_states.append(state[1])
 
         # return result states, if there are none, go to sink state
-        return result_states if result_states else [-1]
\ No newline at end of file
+        return result_states if result_states else [-1]
+
+    def _collect_states(self):
+        """Returns sorted list of all states used in initial, accepting states and transitions."""
+        states = set(self._initial_states) | set(self._accepting_states)
+        for state_from, transitions in self._transition_dict.items():
+            states.add(state_from)
+            for transition in transitions:
+                states.add(transition[1])
+        return sorted(states)
+
+    def trimmed(self):
+        """Returns copy of the automaton without unreachable and dead states. Initial states are kept, so the copy stays valid."""
+        useful_states = self.analysis.useful_states
+        trimmed_automaton = Automaton(self._is_nondeterministic)
+        trimmed_automaton._initial_states = list(self._initial_states)
+        trimmed_automaton._accepting_states = [
+            state for state in self._accepting_states if state in useful_states]
+        for state_from, transitions in self._transition_dict.items():
+            if state_from not in useful_states:
+                continue
+            useful_transitions = [[list(symbols), state_to] for symbols, state_to in transitions
+                                  if symbols and state_to in useful_states]
+            if useful_transitions:
+                trimmed_automaton._transition_dict[state_from] = useful_transitions
+        return trimmed_automaton
+
+    def compact(self):
+        """Returns read-only copy of the automaton with transitions packed into integer arrays."""
+        # initialising here, to avoid circular import
+        from compact_automaton import CompactAutomaton
+
+        return CompactAutomaton(self)
+
+    def canonical_form(self):
+        """Returns the minimal dfa of the language in canonical numbering. Language equivalent automata have equal forms."""
+        return self.compact().canonical_form()
+
+    def canonical_signature(self, canonical_form=None):
+        """Returns hash of the canonical form of the automaton."""
+        canonical_form = canonical_form or self.canonical_form()
+        return hashlib.sha256(repr(canonical_form).encode("utf-8")).hexdigest()
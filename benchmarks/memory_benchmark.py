@@ -0,0 +1,70 @@
+# run from the root of the game: python -m benchmarks.memory_benchmark
+import os
+import random
+import tracemalloc
+
+# no window and no audio device are needed for measuring
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from config.pygame_setup import pygame
+pygame.display.set_mode((1, 1))
+
+from automaton import Automaton
+from objects.arrow import Arrow
+from objects.circle import Circle
+
+
+ELEMENT_COUNT = 10000
+
+
+def measure(build):
+    """Returns the result of build and the number of bytes it allocated."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return result, allocated
+
+
+def build_automaton():
+    """Builds nondeterministic automaton with ELEMENT_COUNT states, every state has one transition per symbol."""
+    random.seed(0)
+    automaton = Automaton(1)
+    automaton.initial_states = [0]
+    automaton.accepting_states = list(range(0, ELEMENT_COUNT, 10))
+    for state in range(ELEMENT_COUNT):
+        for symbol in automaton._alphabet:
+            automaton.transition_dict.setdefault(state, []).append(
+                [[symbol], random.randrange(ELEMENT_COUNT)])
+    return automaton
+
+
+def report(name, allocated, count, unit):
+    print(f"{name:<28}{allocated / count:>10.1f} bytes per {unit}")
+
+
+def main():
+    transition_count = ELEMENT_COUNT * 4
+
+    automaton, allocated = measure(build_automaton)
+    report("Automaton (transition_dict)", allocated, ELEMENT_COUNT, "state")
+    report("", allocated, transition_count, "transition")
+
+    compact, allocated = measure(automaton.compact)
+    report("CompactAutomaton", allocated, ELEMENT_COUNT, "state")
+    report("", allocated, transition_count, "transition")
+
+    circles, allocated = measure(
+        lambda: [Circle(i % 1280, i % 720, i) for i in range(ELEMENT_COUNT)])
+    report("Circle", allocated, ELEMENT_COUNT, "board object")
+
+    arrows, allocated = measure(
+        lambda: [Arrow((i % 1280, 0), (i % 1280, 100)) for i in range(ELEMENT_COUNT)])
+    report("Arrow", allocated, ELEMENT_COUNT, "board object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# run from the root of the game: python -m benchmarks.reduction_benchmark
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from automaton import Automaton
+from simulation_reduction import CheckerStats, reduce_nfa
+
+
+def build_redundant_nfa(copies, size):
+    """Builds nfa made of several copies of the same random automaton, copies simulate each other."""
+    random.seed(0)
+    base = {state: [(random.choice("zxcv"), random.randrange(size)) for _ in range(3)]
+            for state in range(size)}
+    automaton = Automaton(1)
+    for copy in range(copies):
+        offset = copy * size
+        automaton.add_initial_state(offset)
+        automaton.add_accepting_state(offset + size - 1)
+        for state, transitions in base.items():
+            for symbol, state_to in transitions:
+                # some transitions jump into the next copy, so the copies are tangled together
+                target_copy = (copy + 1) % copies if state_to % 4 == 0 else copy
+                automaton.transition_dict.setdefault(offset + state, []).append(
+                    [[symbol], target_copy * size + state_to])
+    return automaton
+
+
+def timed_determinisation(automaton):
+    """Returns seconds the determinisation took and the number of dfa states."""
+    start = time.perf_counter()
+    dfa = automaton.determinise_nfa()
+    return time.perf_counter() - start, len(dfa._collect_states())
+
+
+def main():
+    stats = CheckerStats()
+    for copies, size in ((2, 8), (3, 8), (4, 10)):
+        automaton = build_redundant_nfa(copies, size)
+        # the game determinises only the reduced nfa, this is what the reduction saves it
+        unreduced_seconds, unreduced_dfa_states = timed_determinisation(automaton)
+        reduced = reduce_nfa(automaton, stats)
+        reduced_seconds, reduced_dfa_states = timed_determinisation(reduced)
+        print(f"{copies * size:>4} states -> {len(reduced._collect_states()):>3}: "
+              f"determinisation {unreduced_seconds * 1000:8.2f} ms -> {reduced_seconds * 1000:8.2f} ms "
+              f"({(unreduced_seconds - reduced_seconds) * 1000:.2f} ms avoided), "
+              f"dfa states {unreduced_dfa_states} -> {reduced_dfa_states}")
+    print(stats.as_dict())
+
+
+if __name__ == "__main__":
+    main()
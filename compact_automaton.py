@@ -0,0 +1,155 @@
+from array import array
+
+
+class CompactAutomaton():
+    """Read-only automaton with transitions packed into flat integer arrays. States are renumbered from 0."""
+
+    __slots__ = ("_alphabet", "_states", "_state_index", "_offsets", "_targets",
+                 "_initial_mask", "_accepting_mask")
+
+    def __init__(self, automaton):
+        """Packs the transitions of the given automaton."""
+        self._alphabet = tuple(automaton._alphabet)
+        # original state numbers (or tuples of states for determinised automata), position is the new number
+        self._states = tuple(automaton._collect_states())
+        self._state_index = {state: index for index,
+                             state in enumerate(self._states)}
+
+        # targets of state i under symbol j are _targets[_offsets[i * k + j]:_offsets[i * k + j + 1]]
+        symbol_count = len(self._alphabet)
+        buckets = [[] for _ in range(len(self._states) * symbol_count)]
+        for state_from, transitions in automaton._transition_dict.items():
+            row = self._state_index[state_from] * symbol_count
+            for symbols, state_to in transitions:
+                for symbol in symbols:
+                    buckets[row + self._alphabet.index(symbol)].append(
+                        self._state_index[state_to])
+
+        self._offsets = array("I", [0])
+        self._targets = array("I")
+        for bucket in buckets:
+            self._targets.extend(sorted(set(bucket)))
+            self._offsets.append(len(self._targets))
+
+        # sets of states are kept as bitsets, bit i is the state with new number i
+        self._initial_mask = self._to_mask(automaton._initial_states)
+        self._accepting_mask = self._to_mask(automaton._accepting_states)
+
+    @property
+    def alphabet(self):
+        return self._alphabet
+
+    @property
+    def state_count(self):
+        return len(self._states)
+
+    @property
+    def initial_mask(self):
+        return self._initial_mask
+
+    @property
+    def accepting_mask(self):
+        return self._accepting_mask
+
+    @property
+    def nbytes(self):
+        """Bytes taken by the packed transition arrays."""
+        return (self._offsets.itemsize * len(self._offsets)
+                + self._targets.itemsize * len(self._targets))
+
+    def _to_mask(self, states):
+        """Packs the given states into a bitset."""
+        mask = 0
+        for state in states:
+            if state in self._state_index:
+                mask |= 1 << self._state_index[state]
+        return mask
+
+    def state_number(self, index):
+        """Returns the original state for the new state number."""
+        return self._states[index]
+
+    def states_of(self, mask):
+        """Unpacks the bitset into a list of original states."""
+        states = []
+        while mask:
+            lowest_bit = mask & -mask
+            states.append(self._states[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return states
+
+    def successors(self, index, symbol_index):
+        """Returns the new numbers of the states reachable from state index under the symbol."""
+        row = index * len(self._alphabet) + symbol_index
+        return self._targets[self._offsets[row]:self._offsets[row + 1]]
+
+    def step(self, mask, symbol):
+        """Returns the bitset of states reachable from any state in mask under the symbol."""
+        symbol_index = self._alphabet.index(symbol)
+        new_mask = 0
+        while mask:
+            lowest_bit = mask & -mask
+            for target in self.successors(lowest_bit.bit_length() - 1, symbol_index):
+                new_mask |= 1 << target
+            mask ^= lowest_bit
+        return new_mask
+
+    def run(self, word):
+        """Returns the trace of the word, bitset of active states before reading anything and after every symbol."""
+        trace = [self._initial_mask]
+        for symbol in word:
+            trace.append(self.step(trace[-1], symbol))
+        return trace
+
+    def accepts(self, word):
+        """Checks if the automaton accepts the word."""
+        return bool(self.run(word)[-1] & self._accepting_mask)
+
+    def canonical_form(self):
+        """Returns the minimal complete dfa of the language, with states numbered in bfs order over the alphabet."""
+        # subset construction over bitsets, works for both dfa and nfa. the empty subset is the sink state
+        subsets = [self._initial_mask]
+        subset_index = {self._initial_mask: 0}
+        table = []
+        position = 0
+        while position < len(subsets):
+            row = []
+            for symbol in self._alphabet:
+                new_subset = self.step(subsets[position], symbol)
+                if new_subset not in subset_index:
+                    subset_index[new_subset] = len(subsets)
+                    subsets.append(new_subset)
+                row.append(subset_index[new_subset])
+            table.append(row)
+            position += 1
+
+        # moore's partition refinement, starting from accepting and non accepting blocks
+        blocks = [int(bool(subset & self._accepting_mask)) for subset in subsets]
+        block_count = len(set(blocks))
+        while True:
+            signatures = {}
+            new_blocks = [signatures.setdefault((blocks[state], tuple(blocks[target] for target in table[state])), len(signatures))
+                          for state in range(len(subsets))]
+            blocks = new_blocks
+            if len(signatures) == block_count:
+                break
+            block_count = len(signatures)
+
+        # renumbering blocks in bfs order, so equal languages always give equal forms
+        representatives = {}
+        for state in range(len(subsets)):
+            representatives.setdefault(blocks[state], state)
+        order = {blocks[0]: 0}
+        queue = [blocks[0]]
+        position = 0
+        while position < len(queue):
+            for target in table[representatives[queue[position]]]:
+                if blocks[target] not in order:
+                    order[blocks[target]] = len(order)
+                    queue.append(blocks[target])
+            position += 1
+
+        accepting = tuple(bool(subsets[representatives[block]] & self._accepting_mask) for block in queue)
+        transitions = tuple(tuple(order[blocks[target]] for target in table[representatives[block]])
+                            for block in queue)
+        return (self._alphabet, accepting, transitions)
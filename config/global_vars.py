@@ -1,3 +1,4 @@
+import os
 import pygame
 
 # font
@@ -17,3 +18,9 @@ game_icon = pygame.image.load("assets/circle_initial.png")
 pygame.display.set_icon(game_icon)
 
 screen_width, screen_height = (1280, 720)
+
+# authoring, levels file is reloaded while playing when AUTOMATONTRON_WATCH_LEVELS=1
+watch_levels = os.environ.get("AUTOMATONTRON_WATCH_LEVELS") == "1"
+
+# input of every played session is logged into this directory when AUTOMATONTRON_RECORD_INPUT is set, for replays
+record_input = os.environ.get("AUTOMATONTRON_RECORD_INPUT")
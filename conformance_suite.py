@@ -0,0 +1,124 @@
+from collections import deque
+from itertools import product
+
+
+class ConformanceSuite():
+    """W-method test suite of a level automaton. Rejects most wrong player automata without the full product check."""
+
+    def __init__(self, level_automaton, extra_states=1):
+        """Computes the suite once. It is complete for player automata with up to extra_states more states than the minimal level dfa."""
+        alphabet, accepting, transitions = level_automaton.canonical_form()
+        self._alphabet = alphabet
+        self.extra_states = extra_states
+
+        access_words = self._access_words(transitions)
+        characterisation_set = self._characterisation_set(accepting, transitions)
+        # transition cover: every state reached, then every symbol taken from it
+        transition_cover = set(access_words)
+        for word in access_words:
+            transition_cover.update(word + symbol for symbol in alphabet)
+        middle_words = [""]
+        for length in range(1, extra_states + 1):
+            middle_words.extend("".join(letters) for letters in product(alphabet, repeat=length))
+
+        words = {prefix + middle + suffix for prefix in transition_cover
+                 for middle in middle_words for suffix in characterisation_set}
+        self._build_trie(words, accepting, transitions)
+
+    @classmethod
+    def from_trie(cls, alphabet, extra_states, trie):
+        """Restores the suite from its prefix tree (parents, symbols, expected), e.g. as stored in the level pack."""
+        suite = cls.__new__(cls)
+        suite._alphabet = alphabet
+        suite.extra_states = extra_states
+        suite._parents, suite._symbols, suite._expected = trie
+        suite._words = [""]
+        for parent, symbol in zip(suite._parents[1:], suite._symbols[1:]):
+            suite._words.append(suite._words[parent] + symbol)
+        return suite
+
+    @property
+    def trie(self):
+        """Prefix tree of the suite as (parent, symbol, expected verdict) lists of its nodes in bfs order."""
+        return self._parents, self._symbols, self._expected
+
+    @property
+    def size(self):
+        return sum(expected is not None for expected in self._expected)
+
+    def _access_words(self, transitions):
+        """Shortest word reaching every state of the dfa."""
+        access_words = {0: ""}
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for symbol, state_to in zip(self._alphabet, transitions[state]):
+                if state_to not in access_words:
+                    access_words[state_to] = access_words[state] + symbol
+                    queue.append(state_to)
+        return list(access_words.values())
+
+    def _characterisation_set(self, accepting, transitions):
+        """Shortest word distinguishing every pair of states of the minimal dfa."""
+        characterisation_set = {""}
+        state_count = len(accepting)
+        for first in range(state_count):
+            for second in range(first + 1, state_count):
+                # searching the pair graph for the first word accepted from only one of the states
+                seen = {(first, second)}
+                queue = deque([(first, second, "")])
+                while queue:
+                    state_1, state_2, word = queue.popleft()
+                    if accepting[state_1] != accepting[state_2]:
+                        characterisation_set.add(word)
+                        break
+                    for symbol_index, symbol in enumerate(self._alphabet):
+                        pair = (transitions[state_1][symbol_index], transitions[state_2][symbol_index])
+                        if pair not in seen:
+                            seen.add(pair)
+                            queue.append((*pair, word + symbol))
+        return characterisation_set
+
+    def _build_trie(self, words, accepting, transitions):
+        """Stores the words as a prefix tree in bfs order, so shared prefixes are run only once and shorter words come first."""
+        # children of every node of the prefix tree, node 0 is the empty word
+        children = [{}]
+        for word in words:
+            node = 0
+            for symbol in word:
+                if symbol not in children[node]:
+                    children[node][symbol] = len(children)
+                    children.append({})
+                node = children[node][symbol]
+
+        # flattening in bfs order, parents always come before their children
+        self._parents = [-1]
+        self._symbols = [None]
+        self._words = [""]
+        level_states = [0]
+        order = [0]
+        for index, node in enumerate(order):
+            for symbol_index, symbol in enumerate(self._alphabet):
+                if symbol in children[node]:
+                    order.append(children[node][symbol])
+                    self._parents.append(index)
+                    self._symbols.append(symbol)
+                    self._words.append(self._words[index] + symbol)
+                    level_states.append(transitions[level_states[index]][symbol_index])
+
+        # expected verdict of every tested word, None for prefixes which arent tested themselves
+        self._expected = [accepting[state] if word in words else None
+                          for word, state in zip(self._words, level_states)]
+
+    def find_counter_example(self, player_automaton):
+        """Runs the whole suite on the player automaton at once. Returns (word, should_accept) of the shortest failing test, or None."""
+        compact_automaton = player_automaton.compact()
+        accepting_mask = compact_automaton.accepting_mask
+        masks = [compact_automaton.initial_mask] + [0] * (len(self._parents) - 1)
+        for index in range(len(self._parents)):
+            if index:
+                masks[index] = compact_automaton.step(masks[self._parents[index]], self._symbols[index])
+            expected = self._expected[index]
+            if expected is not None and bool(masks[index] & accepting_mask) != expected:
+                return (self._words[index], expected)
+        return None
@@ -1,9 +1,20 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def render_text(text, font, color):
+    """Renders antialiased text, the same text is rendered only once. The image is shared, so its never drawn on."""
+    return font.render(text, True, color)
+
+
 class DrawText():
     """Mix in class for drawing text on a surface"""
 
+    __slots__ = ()
+
     def draw_text(self, image, text, font, color, x, y):
         """Draws text at the  given coordinates."""
-        text = font.render(text, True, color)  # making text into image
+        text = render_text(text, font, color)  # making text into image
         # making the midbottom of text rectangle to be on the given position
         text_rect = text.get_rect(midbottom=(x, y))
         # drawing text image image, at text_rect position
@@ -11,12 +22,12 @@ class DrawText():
 
     def draw_text_left(self, image, text, font, color, x, y):
         """Draws text justified to left at the given coordinates."""
-        text = font.render(text, True, color)
+        text = render_text(text, font, color)
         text_rect = text.get_rect(topleft=(x, y))
         image.blit(text, text_rect)
 
     def draw_text_centered(self, image, text, font, color):
         """Draws text centered on the given image."""
-        text = font.render(text, True, color)
+        text = render_text(text, font, color)
         text_rect = text.get_rect(center=image.get_rect().center)
         image.blit(text, text_rect)
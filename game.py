@@ -1,14 +1,26 @@
+import os
+import time
 import pygame
 from automaton import Automaton
+from input_log import InputRecorder, InputReplay
+from objects.auto_layout import AutoLayout
+from objects.board_builder import BoardBuilder
 from objects.button import Button
 from objects.circle_destroyer import CircleDestroyer
 from objects.circle_generator import CircleGenerator
+from objects.dead_state_highlight import DeadStateHighlight
+from objects.dirty_renderer import DirtyRenderer
 from objects.environment import Environment
 from levels.file_handler import FileHandler
-from config.global_vars import screen_width, screen_height
+from levels.level_prefetcher import LevelPrefetcher
+from levels.level_watcher import LevelWatcher
+from config.global_vars import screen_width, screen_height, watch_levels, record_input
 from objects.helper_dialogue import HelperDialogue
 from menu import Menu
 from objects.player import Player
+from objects.simulation import Simulation
+from objects.spatial_group import SpatialGroup
+from telemetry import telemetry
 
 
 class Game():
@@ -18,6 +30,8 @@ class Game():
         """Initialises all needed classes, flags and variables to run the game."""
         self.playing = False
         self._FPS = 60
+        # frames taking longer than this are reported to telemetry
+        self._frame_spike_ms = 50
         self._clock = pygame.time.Clock()
         self.screen = pygame.display.set_mode((screen_width, screen_height))
         self._screen_width, self._screen_height = self.screen.get_size()
@@ -40,14 +54,25 @@ class Game():
             middle_of_screen - self._small_offset, screen_height - self._small_offset))
         self.helper_dialogue_group = pygame.sprite.GroupSingle(
             HelperDialogue(middle_of_screen, self._small_offset + 50))
-        self.circle_group = pygame.sprite.Group()
-        self.arrow_group = pygame.sprite.Group()
+        # board groups are indexed by position, collisions are tested only with nearby circles and arrows
+        self.circle_group = SpatialGroup()
+        self.arrow_group = SpatialGroup()
         self.ui_elements_group = pygame.sprite.LayeredDirty()
         ui_elements = (self.helper_dialogue_group.sprite, self.button_group.sprite,
                        self.circle_generator_group.sprite, self.circle_destroyer_group)
         self.ui_elements_group.add(*ui_elements)
         self.automaton_var = Automaton(0)
         self.level_automaton = None
+        self.level_goal = None
+        self.level_suite = None
+        self.level_language = None
+        # when the current level was loaded, for the attempt history
+        self.level_start_ticks = 0
+        self.simulation = Simulation()
+        self.board_builder = BoardBuilder()
+        self.auto_layout = AutoLayout()
+        self.dead_state_highlight = DeadStateHighlight()
+        self.renderer = DirtyRenderer()
 
         # menu
         self.menu_group = pygame.sprite.GroupSingle(Menu(self.screen))
@@ -63,10 +88,17 @@ class Game():
 
         # levels
         self.file_handler = FileHandler()
+        self.level_prefetcher = LevelPrefetcher(self.file_handler)
+        # only while authoring levels
+        self.level_watcher = LevelWatcher() if watch_levels else None
         self.current_section = 0
         self.current_level = 1
         self.level_info = None
 
+        # input of the played session is logged with AUTOMATONTRON_RECORD_INPUT, replays take input from a log
+        self.input_recorder = None
+        self.input_replay = None
+
         self._action_dict = {
             pygame.K_RETURN: lambda: self._handle_dialogue(),
             pygame.K_ESCAPE: lambda: self._switch_to_menu(),
@@ -77,7 +109,9 @@ class Game():
             pygame.K_z: lambda: self._handle_update_transition("z"),
             pygame.K_x: lambda: self._handle_update_transition("x"),
             pygame.K_c: lambda: self._handle_update_transition("c"),
-            pygame.K_v: lambda: self._handle_update_transition("v")
+            pygame.K_v: lambda: self._handle_update_transition("v"),
+            pygame.K_t: lambda: self.simulation.toggle(),
+            pygame.K_l: lambda: self._handle_auto_layout()
         }
 
     def game_loop(self):
@@ -95,8 +129,12 @@ class Game():
     def _handle_exiting_menu(self):
         """Switches to game on the selected level, and changes the resolution if requested."""
         self._switch_to_game()
+        # menu was drawn over the whole screen
+        self.renderer.invalidate()
         self._handle_loading_level()
         self._change_resolution(self.menu_group.sprite.new_resolution)
+        if self.playing and record_input:
+            self._start_recording()
 
     def _switch_to_game(self):
         """Quits game or goes to game based on menu attribute value."""
@@ -112,22 +150,111 @@ class Game():
         self._delete_sprites()
 
         self.circle_generator_group.sprite.reset_count()
-        self.circle_group = pygame.sprite.Group()
-        self.arrow_group = pygame.sprite.Group()
-
-        self.file_handler.save_unlocked_level(
-            self.current_section, self.current_level)
-        self.level_info = self.file_handler.load_level(
-            self.current_section, self.current_level)
+        self.circle_group = SpatialGroup()
+        self.arrow_group = SpatialGroup()
+
+        # replays dont change the progress of the player
+        if not self.input_replay:
+            self.file_handler.save_unlocked_level(
+                self.current_section, self.current_level)
+        # the next level was most likely prefetched while the previous one was played
+        self.level_info = (self.level_prefetcher.take(self.current_section, self.current_level)
+                           or self.file_handler.load_level(self.current_section, self.current_level))
         self.helper_dialogue_group.sprite.initialize_level_dialogue(
             self.level_info)
         self.helper_dialogue_group.sprite.draw_level_text()
         self.environment_group.sprite.input_language = self.level_info.language
         self.automaton_var = Automaton(self.level_info.section)
         self.level_automaton = self.level_info.automaton
+        self.level_goal = self.level_info.goal
+        self.level_suite = self.level_info.test_suite
+        self.level_language = (self.level_info.language_form, self.level_info.language_signature)
+        self.level_start_ticks = pygame.time.get_ticks()
+        telemetry.set_context(section=self.level_info.section, level=self.level_info.level)
+        telemetry.emit("level_entered", completion=self.level_info.completion)
+        self._restore_board()
+        if self.input_recorder:
+            self._record_level()
         self.automaton_response = None
+        if self.simulation.typing:
+            self.simulation.toggle()
 
         self._handle_completion_screen()
+        self._prefetch_next_level()
+
+    def _prefetch_next_level(self):
+        """Starts loading the level which comes after the current one."""
+        next_level = self.file_handler.next_level(self.level_info.section, self.level_info.level)
+        if next_level:
+            self.level_prefetcher.prefetch(*next_level)
+
+    def _reload_level(self):
+        """Swaps in the edited text and automaton of the current level, keeping the board of the player."""
+        self.level_prefetcher.clear()
+        changed = self.file_handler.reload_levels()
+        self._prefetch_next_level()
+        if self.file_handler.catalogue.reload_error:
+            # the old levels stay, the author sees what to fix without looking at a console
+            self.helper_dialogue_group.sprite.draw_message(
+                f"Levels file not reloaded: {self.file_handler.catalogue.reload_error}")
+        current = (self.level_info.section, self.level_info.level)
+        if current not in changed or self.level_info.level > self.file_handler.catalogue.level_count(current[0]):
+            return  # current level wasnt edited, or it was removed and the player can finish it as it was
+
+        self.level_info = self.file_handler.load_level(*current)
+        self.helper_dialogue_group.sprite.initialize_level_dialogue(
+            self.level_info)
+        self.helper_dialogue_group.sprite.draw_level_text()
+        self.environment_group.sprite.input_language = self.level_info.language
+        self.level_automaton = self.level_info.automaton
+        self.level_goal = self.level_info.goal
+        self.level_suite = self.level_info.test_suite
+        self.level_language = (self.level_info.language_form, self.level_info.language_signature)
+        self.automaton_response = None
+        self._handle_completion_screen()
+
+    def _save_board(self):
+        """Saves the board of the current level, so the player can continue where they left off."""
+        if not self.level_info or self.input_replay:
+            return  # no level was played yet, or its only replayed
+
+        # arrow in process of creation has no transition yet, it isnt saved
+        self.player_group.sprite.current_arrow = None
+        self.player_group.sprite.carrying_circle = None
+        self.file_handler.save_board(self.level_info.section, self.level_info.level,
+                                     self.circle_generator_group.sprite.number,
+                                     self.circle_group.sprites(), self.automaton_var.transition_dict)
+
+    def _restore_board(self):
+        """Rebuilds circles, arrows and the automaton from the saved board of the level."""
+        if self.input_replay:
+            # the level starts with the board and player position it had when it was recorded
+            _, _, player_position, board_data = self.input_replay.next_level()
+            self.player_group.sprite.position_update(*player_position, self.player_group.sprite.rect)
+            board = self.file_handler.board_save.decode(board_data)
+        else:
+            board = self.file_handler.load_board(
+                self.level_info.section, self.level_info.level)
+        if not board:
+            return
+
+        next_number, circle_data, transitions = board
+        saved_automaton = Automaton(self.level_info.section)
+        positions = {}
+        for number, x, y, variant in circle_data:
+            positions[number] = (x, y)
+            # every circle must become a state, even if it has no transitions yet
+            saved_automaton.transition_dict.setdefault(number, [])
+            if variant in ("initial", "initial_accepting"):
+                saved_automaton.add_initial_state(number)
+            if variant in ("accepting", "initial_accepting"):
+                saved_automaton.add_accepting_state(number)
+        for state_from, state_to, symbols in transitions:
+            saved_automaton.transition_dict[state_from].append([symbols, state_to])
+
+        self.board_builder.build(saved_automaton, self.automaton_var, self.circle_group,
+                                 self.arrow_group, positions, self.screen.get_size())
+        self.circle_generator_group.sprite.number = next_number
 
     def _delete_sprites(self):
         """Deletes sprites from group before switching to next level."""
@@ -137,7 +264,7 @@ class Game():
 
     def _handle_completion_screen(self):
         """Handles going back and from the completion screen. Replayability is possible."""
-        if self.level_info.level == 5:
+        if self.level_info.completion:
             for sprite in self.ui_elements_group.sprites():
                 sprite.visible = False
             self.circle_generator_group.sprite.disable()
@@ -175,7 +302,17 @@ class Game():
 
     def _event_handler(self):
         """Handles player's keypresses and quit event."""
-        for event in pygame.event.get():
+        if self.input_replay:
+            events = self.input_replay.next_events()
+            if events is None:
+                self.playing = False  # end of the replayed session
+                return
+        else:
+            events = pygame.event.get()
+        if self.input_recorder:
+            self.input_recorder.record_events(events)
+
+        for event in events:
             if event.type == pygame.QUIT:
                 self._quit_game()
             elif event.type == pygame.KEYDOWN:
@@ -183,18 +320,28 @@ class Game():
 
     def _quit_game(self):
         """Sets up for game quitting by adjusting attribute values."""
+        if self.playing:
+            self._save_board()
+        self._stop_recording()
+        self.file_handler.close()
         self.menu_group.sprite.running_menu = False
         self.playing = False
 
     def _handle_action(self, key):
         """Calls lambda function from the action_dict according to event.key."""
+        # while typing a word for simulation, symbol keys write the word instead of editing arrows
+        if self.simulation.typing and self.simulation.handle_key(key, self.automaton_var, self.circle_group):
+            return
         self._action_dict.get(key, lambda: False)()
 
     def _update_objects(self):
         """Updates position of player, checks collision, handles circle creation and destroying."""
         # player
         # delta_time is used for framerate-independant movement (dt: change in time)
-        delta_time = self._clock.tick(self._FPS) / 2
+        ticks = self.input_replay.ticks() if self.input_replay else self._clock.tick(self._FPS)
+        delta_time = ticks / 2
+        if ticks > self._frame_spike_ms:
+            telemetry.emit("frame_spike", ms=ticks)
         self._player_movement(delta_time)
         self.player_group.sprite.update_objects(
             self.arrow_group, self.circle_group)
@@ -202,6 +349,10 @@ class Game():
         # button
         self._check_button_collision()
 
+        # levels file, while authoring
+        if self.level_watcher and self.level_watcher.changed(pygame.time.get_ticks()):
+            self._reload_level()
+
         # circles
         self.circle_generator_group.sprite.handle_new_circles(
             self.player_group, self.circle_group)
@@ -211,7 +362,10 @@ class Game():
     def _player_movement(self, d_t):
         """Gets pressed keys and hands them over to player movement function."""
         # key is a list of entire keyboard, not one key which is pressed (cannot use to look up keys in dictionary, nor match case)
-        key = pygame.key.get_pressed()
+        key = self.input_replay.key() if self.input_replay else pygame.key.get_pressed()
+        if self.input_recorder:
+            # clock time is what the clock ticked this frame, before it was halved into delta time
+            self.input_recorder.record_frame(self._clock.get_time(), key)
         width, height = self.screen.get_size()
         self.player_group.sprite.movement(key, d_t, width, height)
 
@@ -225,35 +379,45 @@ class Game():
             buttons[0].switch_variant("pressed")
             # game -> button -> automaton (check if it accepts language)
             self.automaton_response = buttons[0].button_pressed(
-                self.automaton_var, self.level_automaton)
+                self.automaton_var, self.level_automaton, self.level_goal, self.level_suite, self.level_language)
+            self._record_attempt()
             self.button_pressed = True
         # player isnt colliding with button, and pressed button before
         elif (not buttons) and self.button_pressed:
             self.button_group.sprite.switch_variant("unpressed")
             self.button_pressed = False
 
+    def _record_attempt(self):
+        """Saves the check into the attempt history, with the counter example if the automaton was wrong."""
+        if self.input_replay:
+            return
+        counter_example = self.automaton_response[0] if isinstance(self.automaton_response, tuple) else None
+        seconds = (pygame.time.get_ticks() - self.level_start_ticks) / 1000
+        self.file_handler.record_attempt(self.level_info.section, self.level_info.level, seconds,
+                                         self.automaton_response is True, counter_example)
+
     def _draw_objects(self):
-        """Draws all game objects and updates the screen."""
-        self.environment_group.draw(self.screen)
-        self.environment_group.sprite.draw_input_language(self.screen)
-        self.ui_elements_group.draw(self.screen)
-        self.arrow_group.draw(self.screen)
-        self.player_group.draw(self.screen)
+        """Draws all game objects, only the parts of the screen which changed are drawn and updated."""
         self.player_group.sprite.update_animation()
-        self.arrow_group.draw(self.screen)
-        self.circle_group.draw(self.screen)
         # in here, so automaton response can overwrite level tips, and showcase its own text
         self.helper_dialogue_group.sprite.draw_automaton_text(
             self.automaton_response)
 
-        # update display
-        pygame.display.flip()
+        # in the order of drawing, arrows are over the player and circles over the arrows
+        blit_sequence = [(sprite.image, sprite.rect) for sprite in self.ui_elements_group.sprites() if sprite.visible]
+        for group in (self.player_group, self.arrow_group, self.circle_group):
+            blit_sequence += [(sprite.image, sprite.rect) for sprite in group]
+        blit_sequence += self.dead_state_highlight.blit_sequence(self.circle_group, self.automaton_var)
+        blit_sequence += self.simulation.blit_sequence(self.screen.get_size())
+
+        self.renderer.render(self.screen, self.environment_group.sprite.background(), blit_sequence)
 
     # methods related to to the action_dict (called from handle_action)
     def _handle_dialogue(self):
         """Drawing dialogue text, handing automaton being correct and resetting flag value."""
         # automaton accepts, load next level
         if self.automaton_response == True:
+            self._save_board()
             self._handle_next_level_setup()
             self._handle_loading_level()
         # automaton either doesnt accept, or theres an error
@@ -270,18 +434,61 @@ class Game():
     def _handle_next_level_setup(self):
         """Handling going to next level, or next section if needed."""
         if self.automaton_response == True:
-            if self.current_level == self.level_info.max_levels_in_current_section:
-                self.current_section += 1
-                self.current_level = 1
-            else:
-                self.current_level += 1
+            next_level = self.file_handler.next_level(self.current_section, self.current_level)
+            if next_level:
+                self.current_section, self.current_level = next_level
 
     def _switch_to_menu(self):
         """Setting correct flags to initiate menu being displayed."""
+        self._save_board()
+        self._stop_recording()
         self.playing = False
         self.menu_group.sprite.running_menu = True
         pygame.mixer.Channel(1).play(self.menu_item)
 
+    def _start_recording(self):
+        """Starts logging input of the session into a new file, beginning with the current level."""
+        os.makedirs(record_input, exist_ok=True)
+        path = os.path.join(record_input, time.strftime("session_%Y%m%d_%H%M%S.bin"))
+        self.input_recorder = InputRecorder(path, self.screen.get_size())
+        self._record_level()
+
+    def _record_level(self):
+        """Logs the current level with the board and player position it starts with."""
+        player = self.player_group.sprite
+        self.input_recorder.record_level(self.level_info.section, self.level_info.level,
+                                         (player.x, player.y), self._encode_board())
+
+    def _encode_board(self):
+        """Returns the current board in the format of board saves."""
+        return self.file_handler.board_save.encode(self.circle_generator_group.sprite.number,
+                                                   self.circle_group.sprites(), self.automaton_var.transition_dict)
+
+    def _stop_recording(self):
+        if self.input_recorder:
+            self.input_recorder.close()
+            self.input_recorder = None
+
+    def replay(self, path):
+        """Plays the logged session without a player and without saving anything. Returns durations of frames, in seconds."""
+        self.input_replay = InputReplay(path)
+        if self.input_replay.screen_size != self.screen.get_size():
+            self.screen = pygame.display.set_mode(self.input_replay.screen_size)
+            self._change_resolution(self.input_replay.screen_size)
+        self.current_section, self.current_level = self.input_replay.first_level
+        self.playing = True
+        self._handle_loading_level()
+
+        frame_times = []
+        while self.playing:
+            start = time.perf_counter()
+            self._event_handler()
+            self._update_objects()
+            self._draw_objects()
+            frame_times.append(time.perf_counter() - start)
+        self.input_replay = None
+        return frame_times
+
     def _handle_adding_arrow(self):
         """Handle start and end of arrow creation. Also adding transition to automaton."""
         self.player_group.sprite.handle_arrow_creation(
@@ -291,8 +498,7 @@ class Game():
 
     def _handle_deleting_arrow(self):
         """Deleting arrow and updating automaton adequately."""
-        arrows = pygame.sprite.spritecollide(
-            self.player_group.sprite, self.arrow_group, False, pygame.sprite.collide_mask) or []
+        arrows = self.arrow_group.collide(self.player_group.sprite) or []
 
         if arrows:
             self.player_group.sprite.current_arrow = None
@@ -304,8 +510,7 @@ class Game():
 
     def _handle_update_transition(self, symbol):
         """Adding or removing symbol from arrow and automaton."""
-        player_arrows = pygame.sprite.spritecollide(
-            self.player_group.sprite, self.arrow_group, False, pygame.sprite.collide_mask)
+        player_arrows = self.arrow_group.collide(self.player_group.sprite)
 
         if player_arrows:
             self.automaton_response = self.automaton_var.handle_update_transition(
@@ -314,3 +519,32 @@ class Game():
             # if the transition isnt added, remove symbol
             if self.automaton_response != 0:
                 player_arrows[0].update_symbol(symbol)
+
+    def _handle_auto_layout(self):
+        """Untangles the board by force directed layout of the circles, then redraws all arrows at once."""
+        if not self.auto_layout.available or not self.circle_group:
+            return
+
+        # arrow in process of creation would point to a circle that moved away, cancelling it
+        if self.player_group.sprite.current_arrow:
+            self.player_group.sprite.current_arrow.kill()
+            self.player_group.sprite.current_arrow = None
+            self.automaton_var.cancel_new_transition()
+        self.player_group.sprite.carrying_circle = None
+
+        circles = self.circle_group.sprites()
+        indices = {circle.number: index for index, circle in enumerate(circles)}
+        edges = [(indices[state_from], indices[transition[1]])
+                 for state_from, transitions in self.automaton_var.transition_dict.items()
+                 for transition in transitions]
+        positions = self.auto_layout.layout([(circle.x, circle.y) for circle in circles], edges,
+                                            self.auto_layout.bounds(*self.screen.get_size()))
+
+        for circle, (x, y) in zip(circles, positions):
+            circle.position_update(x, y, circle.rect)
+
+        # arrows are recreated in one batch from the transitions, instead of following each moved circle
+        for arrow in self.arrow_group:
+            arrow.kill()
+        self.board_builder.build_arrows(self.automaton_var.transition_dict,
+                                        {circle.number: circle for circle in circles}, self.arrow_group)
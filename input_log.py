@@ -0,0 +1,146 @@
+import struct
+from collections import deque
+
+import pygame
+
+
+class InputLog():
+    """Compact binary log of a played session: key events, held movement keys and delta time of every frame.
+
+    Every loaded level is logged with the board and player position it started with, so the session can be replayed
+    without the saves."""
+
+    # header: magic, version, screen width, screen height
+    _header = struct.Struct("<4sBHH")
+    # level: section, level, player x, player y, length of the board. followed by the board in the board save format
+    _level = struct.Struct("<HHddI")
+    # frame: milliseconds since the previous frame, held movement keys, number of events. followed by the events
+    _frame = struct.Struct("<IBB")
+    # event: kind, key
+    _event = struct.Struct("<BI")
+    _magic = b"ATIL"
+    _version = 1
+    _level_tag = b"L"
+    _frame_tag = b"F"
+
+    # movement keys, held ones are stored as bits in this order
+    _movement_keys = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+    _quit_event, _key_event = 0, 1
+
+    def _held_keys(self, held):
+        """Movement keys in the shape of pygame.key.get_pressed, keys that arent logged are never held."""
+        return {movement_key: bool(held >> bit & 1) for bit, movement_key in enumerate(self._movement_keys)}
+
+
+class InputRecorder(InputLog):
+    """Writes the session into the log while its played."""
+
+    def __init__(self, path, screen_size):
+        """Creates the log at path, for a session played on a screen of the given size."""
+        self._file = open(path, "wb")
+        self._file.write(self._header.pack(self._magic, self._version, *screen_size))
+        # events of the current frame, written together with its delta time
+        self._events = []
+        # levels loaded by events of the current frame, written after it
+        self._levels = bytearray()
+
+    def record_level(self, section, level, player_position, board):
+        """Logs loading of the level, board is the encoded board it started with."""
+        data = self._level_tag + self._level.pack(section, level, *player_position, len(board)) + board
+        if self._events:
+            self._levels += data
+        else:
+            self._file.write(data)
+
+    def record_events(self, events):
+        """Keeps the events, which the game handles, until the frame is recorded."""
+        for event in events:
+            if event.type == pygame.QUIT:
+                self._events.append((self._quit_event, 0))
+            elif event.type == pygame.KEYDOWN:
+                self._events.append((self._key_event, event.key))
+
+    def record_frame(self, ticks, key):
+        """Logs the frame with the milliseconds it took and the movement keys held in it."""
+        held = sum(1 << bit for bit, movement_key in enumerate(self._movement_keys) if key[movement_key])
+        data = bytearray(self._frame_tag + self._frame.pack(ticks, held, len(self._events)))
+        for kind, event_key in self._events:
+            data += self._event.pack(kind, event_key)
+        self._file.write(data + self._levels)
+        self._events = []
+        self._levels = bytearray()
+
+    def close(self):
+        """Writes the unfinished frame, its events ended the session."""
+        if self._events:
+            self.record_frame(0, self._held_keys(0))
+        self._file.close()
+
+
+class InputReplay(InputLog):
+    """Reads the log and hands its frames back to the game in the order they were played."""
+
+    def __init__(self, path):
+        """Reads the whole log, raises ValueError if it isnt an input log."""
+        with open(path, "rb") as file:
+            data = file.read()
+        try:
+            magic, version, width, height = self._header.unpack_from(data)
+            if magic != self._magic or version != self._version:
+                raise ValueError(f"{path} isnt an input log of this version")
+            self.screen_size = (width, height)
+            self._records = deque(self._parse(data, self._header.size))
+        except (struct.error, IndexError):
+            raise ValueError(f"input log {path} is damaged")
+
+        levels = [record for kind, record in self._records if kind == self._level_tag]
+        if not levels:
+            raise ValueError(f"input log {path} has no level")
+        # (section, level) the session started in
+        self.first_level = levels[0][:2]
+        self.frame_count = len(self._records) - len(levels)
+        self._ticks = 0
+        self._key = self._held_keys(0)
+
+    def _parse(self, data, offset):
+        """Yields (tag, record) of every level and frame in the log."""
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            offset += 1
+            if tag == self._level_tag:
+                section, level, x, y, board_length = self._level.unpack_from(data, offset)
+                offset += self._level.size
+                yield tag, (section, level, (x, y), data[offset:offset + board_length])
+                offset += board_length
+            elif tag == self._frame_tag:
+                ticks, held, event_count = self._frame.unpack_from(data, offset)
+                offset += self._frame.size
+                events = [self._event.unpack_from(data, offset + index * self._event.size)
+                          for index in range(event_count)]
+                offset += event_count * self._event.size
+                yield tag, (ticks, held, events)
+            else:
+                raise IndexError(tag)
+
+    def next_level(self):
+        """Returns (section, level, player position, board) of the level loaded now, or None if the log doesnt continue with a level."""
+        if not self._records or self._records[0][0] != self._level_tag:
+            return None
+        return self._records.popleft()[1]
+
+    def next_events(self):
+        """Starts the next frame and returns its events, or None if the log has ended."""
+        if not self._records or self._records[0][0] != self._frame_tag:
+            return None
+        _, (self._ticks, held, events) = self._records.popleft()
+        self._key = self._held_keys(held)
+        return [pygame.event.Event(pygame.QUIT) if kind == self._quit_event
+                else pygame.event.Event(pygame.KEYDOWN, key=key) for kind, key in events]
+
+    def ticks(self):
+        """Milliseconds the current frame took when it was played."""
+        return self._ticks
+
+    def key(self):
+        """Movement keys held in the current frame."""
+        return self._key
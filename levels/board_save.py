@@ -0,0 +1,116 @@
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoardSave():
+    """Stores unfinished boards of levels in a compact versioned binary format."""
+
+    # header: magic, version, number of circles, number of transitions, number of the next generated circle
+    _header = struct.Struct("<3sBHHH")
+    # circle: number, x, y, variant
+    _circle = struct.Struct("<HhhB")
+    # transition: circle from, circle to, number of symbols. followed by that many symbol indices
+    _transition = struct.Struct("<HHB")
+    _magic = b"ATB"
+    _version = 1
+
+    _variants = ("base", "initial", "accepting", "initial_accepting")
+    _alphabet = ("z", "x", "c", "v")
+
+    def __init__(self, directory="levels/boards"):
+        """Creates board save storing its files in the given directory."""
+        self._directory = directory
+        # boards are written in the background, path -> future of the last write
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._pending = {}
+
+    def _path(self, profile, section, level):
+        # every profile has its own boards, hex of the name is safe in any file system and cant collide
+        return os.path.join(self._directory, profile.encode("utf-8").hex(), f"section_{section}_level_{level}.bin")
+
+    def save_board(self, profile, section, level, next_number, circles, transition_dict):
+        """Encodes the board of the profile and writes it in the background."""
+        path = self._path(profile, section, level)
+        self._pending[path] = self._writer.submit(
+            self._write, path, self.encode(next_number, circles, transition_dict))
+
+    def encode(self, next_number, circles, transition_dict):
+        """Returns the board in the binary format."""
+        transitions = [(state_from, transition[1], transition[0])
+                       for state_from, state_transitions in transition_dict.items()
+                       for transition in state_transitions]
+
+        data = bytearray(self._header.pack(
+            self._magic, self._version, len(circles), len(transitions), next_number))
+        for circle in circles:
+            data += self._circle.pack(circle.number, round(circle.x), round(circle.y),
+                                      self._variants.index(circle.variant))
+        for state_from, state_to, symbols in transitions:
+            data += self._transition.pack(state_from, state_to, len(symbols))
+            data += bytes(self._alphabet.index(symbol) for symbol in symbols)
+        return bytes(data)
+
+    def _write(self, path, data):
+        """Writes the board atomically, the old save is replaced only after the new one is complete."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+
+    def close(self):
+        """Waits until every board is written."""
+        for future in self._pending.values():
+            future.result()
+        self._pending = {}
+
+    def load_board(self, profile, section, level):
+        """Reads the board of the level saved by the profile. Returns (next_number, circles, transitions), or None if theres no usable save."""
+        path = self._path(profile, section, level)
+        # the board might still be on its way to the disk
+        if path in self._pending:
+            self._pending.pop(path).result()
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        return self.decode(data)
+
+    def decode(self, data):
+        """Reads the board from the binary format. Returns (next_number, circles, transitions), or None if its unusable."""
+        try:
+            magic, version, circle_count, transition_count, next_number = self._header.unpack_from(data)
+            if magic != self._magic or version != self._version:
+                return None  # save from another version, starting with an empty board
+
+            offset = self._header.size
+            circles_end = offset + circle_count * self._circle.size
+            # circles are (number, x, y, variant)
+            circles = [(number, x, y, self._variants[variant]) for number, x, y, variant
+                       in self._circle.iter_unpack(data[offset:circles_end])]
+
+            offset = circles_end
+            # transitions are (circle from, circle to, symbols)
+            transitions = []
+            for _ in range(transition_count):
+                state_from, state_to, symbol_count = self._transition.unpack_from(data, offset)
+                offset += self._transition.size
+                symbols = [self._alphabet[index] for index in data[offset:offset + symbol_count]]
+                offset += symbol_count
+                transitions.append((state_from, state_to, symbols))
+        except (struct.error, IndexError):
+            return None  # damaged save, starting with an empty board
+        if offset != len(data):
+            return None  # cut off inside the symbols of the last transition, or followed by something else
+
+        # transitions may only join circles of the board, every circle is there once
+        numbers = {number for number, _, _, _ in circles}
+        if len(numbers) != len(circles) or any(state_from not in numbers or state_to not in numbers
+                                               for state_from, state_to, _ in transitions):
+            return None
+
+        return next_number, circles, transitions
@@ -1,23 +1,39 @@
+from levels.board_save import BoardSave
 from levels.level import Level
+from levels.level_pack import LevelPack
+from levels.progress_store import ProgressStore
 from levels.save import Save
 
 
 class FileHandler():
     """Handles json files of levels and saves."""
 
+    # shared by all file handlers, so the level pack is checked and indexed only once
+    catalogue = LevelPack()
+    # both game class and menu class accesses the save, they are both working with one save -> shared by all file handlers
+    save = Save(catalogue, ProgressStore())
+
     def __init__(self):
         """Creates file handler and initialises save data."""
-        # both game class and menu class accesses the save, they are both working with one save -> made it an attribute
-        self._max_det_levels = 4
-        self._max_nondet_levels = 4
-        self.save = Save(self._max_det_levels, self._max_nondet_levels)
+        self.board_save = BoardSave()
 
     def load_level(self, section, level):
         """Initialises level at the given section and level number."""
         level = Level(section, level)
-        level.initialize_data()
+        level.initialize_data(self.catalogue)
         return level
 
+    def next_level(self, section, level):
+        """Returns (section, level) after the given level, or None after the last one."""
+        return self.catalogue.next_level(section, level)
+
+    def reload_levels(self):
+        """Reloads the changed levels file. Returns set of (section, level) which changed."""
+        changed = self.catalogue.reload()
+        if changed:
+            self.save.levels_changed()
+        return changed
+
     def load_unlocks(self):
         """Loads the unlocked levels."""
         self.save.load_data()
@@ -26,3 +42,20 @@ class FileHandler():
     def save_unlocked_level(self, section, level):
         """Saves that the given level is unlocked."""
         self.save.save_unlocked_level(section, level)
+
+    def record_attempt(self, section, level, seconds, solved, counter_example=None):
+        """Saves one check of the player automaton into the attempt history."""
+        self.save.record_attempt(section, level, seconds, solved, counter_example)
+
+    def close(self):
+        """Writes the progress and boards still waiting in the background."""
+        self.save.close()
+        self.board_save.close()
+
+    def save_board(self, section, level, next_number, circles, transition_dict):
+        """Saves the unfinished board of the level for the current profile."""
+        self.board_save.save_board(self.save.profile, section, level, next_number, circles, transition_dict)
+
+    def load_board(self, section, level):
+        """Loads the board of the level saved by the current profile, None if there isnt one."""
+        return self.board_save.load_board(self.save.profile, section, level)
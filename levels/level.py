@@ -1,6 +1,8 @@
-import json
+import hashlib
 
 from automaton import Automaton
+from conformance_suite import ConformanceSuite
+from multi_product_automaton import LevelGoal
 
 
 class Level():
@@ -11,32 +13,62 @@ class Level():
         self.section = section
         self.max_levels_in_current_section = None
         self.level = level
+        self.completion = False
         self.text_lines = None
         self.language = None
         self.automaton = None
+        self.goal = None
+        self.test_suite = None
+        # canonical forms of the level automata and the goal bounds, equal for levels of the same language
+        self.language_form = None
+        self.language_signature = None
 
-    def initialize_data(self):
-        """Initialising the level data from a json file."""
-        with open("levels/levels.json", "r", encoding="utf-8") as file:
-            file_content = file.read()
-            file_dict = json.loads(file_content)
-
-            self.max_levels_in_current_section = len(
-                file_dict[f"section_{self.section}"])
-            # levels are indexed from 1 in menu, but from 0 in dictionary
-            level_index = self.level - 1
-
-            initial_states = file_dict[f"section_{self.section}"][level_index]["initial_states"]
-            accepting_states = file_dict[f"section_{self.section}"][level_index]["accepting_states"]
-            transition_dict = file_dict[f"section_{self.section}"][level_index]["transition_dict"]
-            # converting json keys from strings to ints
-            transition_dict = {int(key): value for key,
-                               value in transition_dict.items()}
-            self.language = file_dict[f"section_{self.section}"][level_index]["language"]
-            self.text_lines = file_dict[f"section_{self.section}"][level_index]["text_lines"]
-
-            # 0 -> DFA since DFA and NFA recognise the same languages. deterministic product automaton makes language checking easier
-            self.automaton = Automaton(0)
-            self.automaton.initial_states = initial_states
-            self.automaton.accepting_states = accepting_states
-            self.automaton.transition_dict = transition_dict
+    def initialize_data(self, catalogue):
+        """Initialising the level data from the level catalogue."""
+        self.max_levels_in_current_section = catalogue.level_count(self.section)
+        self.completion = catalogue.is_completion(self.section, self.level)
+        level_data = catalogue.level_data(self.section, self.level)
+
+        self.language = level_data["language"]
+        self.text_lines = level_data["text_lines"]
+
+        # levels with a goal can leave out the single level automaton
+        if "automaton" in level_data:
+            self.automaton = self._build_automaton(level_data["automaton"])
+            # the suite was computed when the level pack was built
+            self.test_suite = ConformanceSuite.from_trie(*level_data["suite"])
+        if "goal" in level_data:
+            goal_data = level_data["goal"]
+            goal_automata = [self._build_automaton(minimal_dfa)
+                             for minimal_dfa in goal_data["automata"]]
+            self.goal = LevelGoal(goal_automata, goal_data.get(
+                "lower"), goal_data.get("upper"))
+
+        # the pack already holds the minimal dfas in canonical numbering, so nothing is minimised here
+        goal_data = level_data.get("goal", {})
+        self.language_form = (level_data.get("automaton"), tuple(goal_data.get("automata", ())),
+                              repr((goal_data.get("lower"), goal_data.get("upper"))))
+        self.language_signature = hashlib.sha256(repr(self.language_form).encode("utf-8")).hexdigest()
+
+    def _build_automaton(self, minimal_dfa):
+        """Creates automaton from the minimal dfa (alphabet, accepting, transitions) compiled in the level pack."""
+        alphabet, accepting, transitions = minimal_dfa
+        # transitions into the dead state are left out, same as in the levels file
+        dead_states = {state for state, targets in enumerate(transitions)
+                       if not accepting[state] and all(target == state for target in targets)}
+
+        transition_dict = {}
+        for state_from, targets in enumerate(transitions):
+            symbols_to = {}
+            for symbol, state_to in zip(alphabet, targets):
+                if state_to not in dead_states:
+                    symbols_to.setdefault(state_to, []).append(symbol)
+            if symbols_to:
+                transition_dict[state_from] = [[symbols, state_to] for state_to, symbols in symbols_to.items()]
+
+        # 0 -> DFA since DFA and NFA recognise the same languages. deterministic product automaton makes language checking easier
+        automaton = Automaton(0)
+        automaton.initial_states = [0]
+        automaton.accepting_states = [state for state, flag in enumerate(accepting) if flag]
+        automaton.transition_dict = transition_dict
+        return automaton
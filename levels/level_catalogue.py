@@ -0,0 +1,96 @@
+import json
+import re
+from array import array
+
+
+class LevelCatalogue():
+    """Index of the levels file. The file is scanned once, single levels are read and parsed only when loaded."""
+
+    # strings are matched whole, so brackets inside of them are skipped
+    _token = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+    _section_key = re.compile(r"section_(\d+)")
+    _section_titles = {0: "deterministic", 1: "nondeterministic"}
+
+    def __init__(self, path="levels/levels.json"):
+        """Creates catalogue of the levels file, indexed when it is first needed."""
+        self._path = path
+        # section -> (offsets, lengths) of the level objects in the file, in bytes
+        self._index = None
+
+    @property
+    def sections(self):
+        """Section numbers in ascending order."""
+        return sorted(self._get_index())
+
+    def _get_index(self):
+        if self._index is None:
+            with open(self._path, "rb") as file:
+                self._index = self._scan(file.read())
+        return self._index
+
+    def _scan(self, data):
+        """Finds where every level object starts and ends, without parsing the levels."""
+        index = {}
+        depth = 0
+        key = None
+        offsets = lengths = None
+        level_start = 0
+        for match in self._token.finditer(data):
+            token = match.group()
+            if token[0] == ord('"'):
+                if depth == 1:
+                    key = token
+                continue
+
+            if token in (b"{", b"["):
+                depth += 1
+                if depth == 2:
+                    # depth 1 is the whole file, depth 2 is the list of levels in a section
+                    section_match = self._section_key.fullmatch(json.loads(key))
+                    if section_match is None:
+                        # a mistyped section would otherwise lose all of its levels without a word
+                        raise ValueError(f"levels file: {json.loads(key)!r} isnt a section_<number> key")
+                    section = int(section_match.group(1))
+                    offsets, lengths = index.setdefault(section, (array("Q"), array("Q")))
+                elif depth == 3:
+                    level_start = match.start()
+            else:
+                if depth == 3:
+                    offsets.append(level_start)
+                    lengths.append(match.end() - level_start)
+                depth -= 1
+        return index
+
+    def section_title(self, section):
+        """Returns the name of the section shown in menu."""
+        return self._section_titles.get(section, f"section {section}")
+
+    def level_count(self, section):
+        """Returns the number of levels in section."""
+        return len(self._get_index()[section][0])
+
+    def playable_level_count(self, section):
+        """Returns the number of levels in section shown in menu, without the completion screen."""
+        count = self.level_count(section)
+        return count - 1 if self.is_completion(section, count) else count
+
+    def is_completion(self, section, level):
+        """The last level of the last section is the completion screen."""
+        last_section = self.sections[-1]
+        return section == last_section and level == self.level_count(last_section)
+
+    def next_level(self, section, level):
+        """Returns (section, level) after the given level, or None after the last one."""
+        if level < self.level_count(section):
+            return section, level + 1
+        later_sections = [other for other in self.sections if other > section]
+        return (later_sections[0], 1) if later_sections else None
+
+    def level_data(self, section, level):
+        """Reads and parses only the data of one level. Levels are numbered from 1."""
+        offsets, lengths = self._get_index()[section]
+        # levels are indexed from 1 in menu, but from 0 in file
+        level_index = level - 1
+        with open(self._path, "rb") as file:
+            file.seek(offsets[level_index])
+            return json.loads(file.read(lengths[level_index]))
@@ -0,0 +1,341 @@
+import hashlib
+import json
+import os
+import struct
+
+from automaton import Automaton
+from conformance_suite import ConformanceSuite
+from levels.level_catalogue import LevelCatalogue
+from telemetry import telemetry
+
+
+class LevelPack(LevelCatalogue):
+    """Levels compiled from the levels file into a binary pack, with level automata already minimised.
+
+    The pack is rebuilt automatically when the levels file changes."""
+
+    # header: magic, version, mtime of levels file in ns, its size, its sha256, number of sections
+    _header = struct.Struct("<4sBQQ32sH")
+    # section: section number, number of levels. followed by (offset, length, digest of its json) of each level
+    _section = struct.Struct("<HI")
+    _level = struct.Struct("<QI16s")
+    _magic = b"ATLP"
+    _version = 4
+
+    _length = struct.Struct("<I")
+    # dfa: number of states, followed by accepting flag of each state and the transition table
+    _dfa = struct.Struct("<H")
+    _no_automaton = 0xFFFF
+    # conformance suite: extra states its complete for, number of nodes of its prefix tree.
+    # followed by expected verdict of every node (2 for untested prefixes), then parent and symbol of every node but the root
+    _suite = struct.Struct("<BI")
+    _suite_node = struct.Struct("<IB")
+    _untested = 2
+    # suite catches every wrong player automaton with at most this many states more than the level dfa
+    _suite_extra_states = 1
+
+    def __init__(self, source="levels/levels.json", path="levels/levels.pack"):
+        """Creates pack of the source levels file, stored at path. Its loaded or built when first needed."""
+        super().__init__(source)
+        self._pack_path = path
+        # pack kept in memory, when it couldnt be written to disk
+        self._pack_data = None
+        # why the last reload kept the old levels, None if it succeeded
+        self.reload_error = None
+
+    def _get_index(self):
+        if self._index is None:
+            source_stat = os.stat(self._path)
+            index = self._load_index(source_stat, None)
+            if index is None:
+                # mtime changed, but the content might still be the same (e.g. after git checkout)
+                with open(self._path, "rb") as file:
+                    digest = hashlib.sha256(file.read()).digest()
+                index = self._load_index(None, digest)
+                if index is not None:
+                    self._update_source_stat(source_stat, digest)
+            if index is None:
+                index = self.build()
+            self._index = index
+        return self._index
+
+    def _load_index(self, source_stat, digest):
+        """Reads the index of the pack on disk, if it was built from the current levels file. Otherwise None."""
+        try:
+            with open(self._pack_path, "rb") as file:
+                header = file.read(self._header.size)
+                magic, version, mtime, size, pack_digest, section_count = self._header.unpack(header)
+                if magic != self._magic or version != self._version:
+                    return None
+                if source_stat and (mtime, size) != (source_stat.st_mtime_ns, source_stat.st_size):
+                    return None
+                if digest and pack_digest != digest:
+                    return None
+                return self._read_index(file, section_count)
+        except (OSError, struct.error):
+            return None
+
+    def _update_source_stat(self, source_stat, digest):
+        """Stores the new mtime of unchanged levels file, so its not hashed again on the next start."""
+        try:
+            with open(self._pack_path, "r+b") as file:
+                section_count = self._header.unpack(file.read(self._header.size))[-1]
+                file.seek(0)
+                file.write(self._header.pack(self._magic, self._version, source_stat.st_mtime_ns,
+                                             source_stat.st_size, digest, section_count))
+        except OSError:
+            pass
+
+    def _read_index(self, file, section_count):
+        index = {}
+        for _ in range(section_count):
+            section, level_count = self._section.unpack(file.read(self._section.size))
+            levels = list(self._level.iter_unpack(file.read(level_count * self._level.size)))
+            index[section] = ([offset for offset, _, _ in levels], [length for _, length, _ in levels],
+                              [digest for _, _, digest in levels])
+        return index
+
+    def _previous_records(self):
+        """Returns digest of level json -> record of the level, from the pack built before, if theres one."""
+        try:
+            if self._pack_data is not None:
+                data = self._pack_data
+            else:
+                with open(self._pack_path, "rb") as file:
+                    data = file.read()
+            magic, version, _, _, _, section_count = self._header.unpack_from(data)
+            if magic != self._magic or version != self._version:
+                return {}
+            offset = self._header.size
+            records = {}
+            for _ in range(section_count):
+                _, level_count = self._section.unpack_from(data, offset)
+                offset += self._section.size
+                for _ in range(level_count):
+                    level_offset, length, digest = self._level.unpack_from(data, offset)
+                    offset += self._level.size
+                    records[digest] = data[level_offset:level_offset + length]
+            return records
+        except (OSError, struct.error):
+            return {}
+
+    def build(self):
+        """Compiles the levels file into the pack and writes it atomically. Returns index of the pack.
+
+        Levels whose json didnt change since the previous pack are copied from it, without parsing them again."""
+        with open(self._path, "rb") as file:
+            source_data = file.read()
+        source_stat = os.stat(self._path)
+        source_index = self._scan(source_data)
+        previous_records = self._previous_records()
+
+        # section -> list of (digest, record)
+        records = {}
+        for section in sorted(source_index):
+            levels = records.setdefault(section, [])
+            for level_index, (offset, length) in enumerate(zip(*source_index[section])):
+                level_json = source_data[offset:offset + length]
+                digest = hashlib.blake2b(level_json, digest_size=16).digest()
+                record = previous_records.get(digest)
+                if record is None:
+                    record = self._compile_level(json.loads(level_json), section, level_index + 1)
+                levels.append((digest, record))
+
+        # tables come first, so levels start right after them
+        offset = (self._header.size + len(records) * self._section.size
+                  + sum(len(levels) for levels in records.values()) * self._level.size)
+        tables = bytearray(self._header.pack(self._magic, self._version, source_stat.st_mtime_ns, source_stat.st_size,
+                                             hashlib.sha256(source_data).digest(), len(records)))
+        body = bytearray()
+        index = {}
+        for section, levels in records.items():
+            tables += self._section.pack(section, len(levels))
+            offsets, lengths, digests = index.setdefault(section, ([], [], []))
+            for digest, record in levels:
+                tables += self._level.pack(offset + len(body), len(record), digest)
+                offsets.append(offset + len(body))
+                lengths.append(len(record))
+                digests.append(digest)
+                body += record
+
+        data = bytes(tables + body)
+        self._pack_data = None
+        try:
+            temporary_path = self._pack_path + ".tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self._pack_path)
+        except OSError:
+            self._pack_data = data  # read only game directory, the pack lives only in memory
+        return index
+
+    def reload(self):
+        """Rebuilds the pack after the levels file changed. Returns set of (section, level) which changed.
+
+        If the levels file is broken, e.g. in the middle of editing, the old levels stay and nothing changes."""
+        old_index = self._get_index()
+        self._index = None
+        try:
+            new_index = self._get_index()
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            self.reload_error = f"{type(error).__name__}: {error}"
+            telemetry.emit("levels_reload_failed", error=self.reload_error)
+            self._index = old_index
+            return set()
+        self.reload_error = None
+
+        changed = set()
+        for section in set(old_index) | set(new_index):
+            old_digests = old_index.get(section, ((), (), ()))[2]
+            new_digests = new_index.get(section, ((), (), ()))[2]
+            for level_index in range(max(len(old_digests), len(new_digests))):
+                if old_digests[level_index:level_index + 1] != new_digests[level_index:level_index + 1]:
+                    changed.add((section, level_index + 1))
+        return changed
+
+    def level_data(self, section, level):
+        """Reads and decodes only the record of one level. Levels are numbered from 1."""
+        offsets, lengths, _ = self._get_index()[section]
+        level_index = level - 1
+        offset, length = offsets[level_index], lengths[level_index]
+        if self._pack_data is not None:
+            return self._decode_level(self._pack_data[offset:offset + length])
+        with open(self._pack_path, "rb") as file:
+            file.seek(offset)
+            return self._decode_level(file.read(length))
+
+    def _compile_level(self, level_data, section, level):
+        """Validates the json data of a level and encodes it into a record."""
+        where = f"section {section} level {level}"
+        record = bytearray()
+        self._write_string(record, level_data["language"])
+        record += self._length.pack(len(level_data["text_lines"]))
+        for line in level_data["text_lines"]:
+            self._write_string(record, line)
+
+        automaton = self._validated_automaton(level_data, where) if "transition_dict" in level_data else None
+        goal_data = level_data.get("goal")
+        goal_automata = [self._validated_automaton(automaton_data, where)
+                         for automaton_data in goal_data["automata"]] if goal_data else []
+
+        if automaton:
+            self._write_dfa(record, automaton)
+            self._write_suite(record, ConformanceSuite(automaton, self._suite_extra_states))
+        else:
+            record += self._dfa.pack(self._no_automaton)
+
+        record += self._length.pack(len(goal_automata))
+        for automaton in goal_automata:
+            self._write_dfa(record, automaton)
+        # bound expressions are small nested lists, kept as json
+        self._write_string(record, json.dumps([goal_data.get("lower"), goal_data.get("upper")]) if goal_data else "")
+        return bytes(record)
+
+    def _validated_automaton(self, automaton_data, where):
+        """Creates automaton from its json data, raises ValueError if the data doesnt describe one."""
+        automaton = Automaton(0)
+        try:
+            transition_dict = {int(key): value for key, value in automaton_data["transition_dict"].items()}
+            states = set(transition_dict)
+            for transitions in transition_dict.values():
+                for symbols, state_to in transitions:
+                    if not isinstance(state_to, int) or any(symbol not in automaton._alphabet for symbol in symbols):
+                        raise ValueError(f"{where}: invalid transition {[symbols, state_to]}")
+                    states.add(state_to)
+            initial_states = automaton_data["initial_states"]
+            accepting_states = automaton_data["accepting_states"]
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"{where}: invalid automaton ({error!r})") from error
+        if not all(isinstance(state, int) for state in initial_states + accepting_states):
+            raise ValueError(f"{where}: states must be numbers")
+
+        automaton.initial_states = initial_states
+        automaton.accepting_states = accepting_states
+        automaton.transition_dict = transition_dict
+        return automaton
+
+    def _write_dfa(self, record, automaton):
+        """Encodes the minimal dfa of the automaton."""
+        _, accepting, transitions = automaton.canonical_form()
+        record += self._dfa.pack(len(accepting))
+        record += bytes(accepting)
+        for row in transitions:
+            record += struct.pack(f"<{len(row)}H", *row)
+
+    def _write_suite(self, record, suite):
+        """Encodes the prefix tree of the conformance suite, so its not computed again when the level is loaded."""
+        parents, symbols, expected = suite.trie
+        symbol_indices = {symbol: index for index, symbol in enumerate(Automaton(0)._alphabet)}
+        record += self._suite.pack(suite.extra_states, len(parents))
+        record += bytes(self._untested if verdict is None else verdict for verdict in expected)
+        for parent, symbol in zip(parents[1:], symbols[1:]):
+            record += self._suite_node.pack(parent, symbol_indices[symbol])
+
+    def _write_string(self, record, value):
+        encoded = value.encode("utf-8")
+        record += self._length.pack(len(encoded))
+        record += encoded
+
+    def _decode_level(self, record):
+        """Decodes record of a level. Automata are minimal dfas as (alphabet, accepting, transitions)."""
+        language, offset = self._read_string(record, 0)
+        (line_count,) = self._length.unpack_from(record, offset)
+        offset += self._length.size
+        text_lines = []
+        for _ in range(line_count):
+            line, offset = self._read_string(record, offset)
+            text_lines.append(line)
+        level_data = {"language": language, "text_lines": text_lines}
+
+        automaton, offset = self._read_dfa(record, offset)
+        if automaton:
+            level_data["automaton"] = automaton
+            level_data["suite"], offset = self._read_suite(record, offset)
+        (goal_count,) = self._length.unpack_from(record, offset)
+        offset += self._length.size
+        goal_automata = []
+        for _ in range(goal_count):
+            goal_automaton, offset = self._read_dfa(record, offset)
+            goal_automata.append(goal_automaton)
+        bounds, offset = self._read_string(record, offset)
+        if bounds:
+            lower, upper = json.loads(bounds)
+            level_data["goal"] = {"automata": goal_automata, "lower": lower, "upper": upper}
+        return level_data
+
+    def _read_dfa(self, record, offset):
+        (state_count,) = self._dfa.unpack_from(record, offset)
+        offset += self._dfa.size
+        if state_count == self._no_automaton:
+            return None, offset
+        # every level automaton has the same alphabet as the player automaton
+        symbols = tuple(Automaton(0)._alphabet)
+        accepting = tuple(bool(flag) for flag in record[offset:offset + state_count])
+        offset += state_count
+        row = struct.Struct(f"<{len(symbols)}H")
+        transitions = tuple(row.iter_unpack(record[offset:offset + state_count * row.size]))
+        offset += state_count * row.size
+        return (symbols, accepting, transitions), offset
+
+    def _read_suite(self, record, offset):
+        """Decodes the conformance suite as (alphabet, extra states, (parents, symbols, expected))."""
+        extra_states, node_count = self._suite.unpack_from(record, offset)
+        offset += self._suite.size
+        expected = [None if verdict == self._untested else bool(verdict)
+                    for verdict in record[offset:offset + node_count]]
+        offset += node_count
+        alphabet = list(Automaton(0)._alphabet)
+        parents, symbols = [-1], [None]
+        node_data = record[offset:offset + (node_count - 1) * self._suite_node.size]
+        for parent, symbol_index in self._suite_node.iter_unpack(node_data):
+            parents.append(parent)
+            symbols.append(alphabet[symbol_index])
+        offset += len(node_data)
+        return (alphabet, extra_states, (parents, symbols, expected)), offset
+
+    def _read_string(self, record, offset):
+        (length,) = self._length.unpack_from(record, offset)
+        offset += self._length.size
+        return record[offset:offset + length].decode("utf-8"), offset + length
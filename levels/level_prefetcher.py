@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LevelPrefetcher():
+    """Loads the next level on a background thread, while the player is still solving the current one."""
+
+    def __init__(self, file_handler):
+        """Creates prefetcher loading levels through the file handler."""
+        self._file_handler = file_handler
+        self._loader = ThreadPoolExecutor(max_workers=1)
+        # only the latest prefetched level is kept, (section, level) -> future of the level
+        self._prefetched = {}
+
+    def prefetch(self, section, level):
+        """Starts loading the level in the background."""
+        if (section, level) not in self._prefetched:
+            self._prefetched = {(section, level): self._loader.submit(
+                self._file_handler.load_level, section, level)}
+
+    def take(self, section, level):
+        """Returns the prefetched level, waiting for it if its still loading. None if it wasnt prefetched."""
+        future = self._prefetched.pop((section, level), None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except (OSError, ValueError):
+            return None  # loading it again in the foreground reports the error
+
+    def clear(self):
+        """Drops the prefetched level, after waiting for it, so the level files can change safely."""
+        for future in self._prefetched.values():
+            future.exception()
+        self._prefetched = {}
@@ -0,0 +1,30 @@
+import os
+
+
+class LevelWatcher():
+    """Polls the levels file for changes while levels are being authored."""
+
+    def __init__(self, path="levels/levels.json", interval=500):
+        """Creates watcher checking the file at most once per interval in milliseconds."""
+        self._path = path
+        self._interval = interval
+        self._last_poll = 0
+        self._last_stat = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None  # editors can replace the file, it can be missing for a moment
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(self, ticks):
+        """Returns True once after the file changed. Ticks are the current time in milliseconds."""
+        if ticks - self._last_poll < self._interval:
+            return False
+        self._last_poll = ticks
+        stat = self._stat()
+        if stat is None or stat == self._last_stat:
+            return False
+        self._last_stat = stat
+        return True
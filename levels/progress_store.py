@@ -0,0 +1,197 @@
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from telemetry import telemetry
+
+
+class ProgressStore():
+    """Sqlite database of player profiles, their unlocked levels and history of their attempts.
+
+    Writes are queued and done in transactions by a background thread, reads see every write queued before them.
+    Writes which fail on a full or locked disk are kept and tried again, so no progress is lost."""
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS unlocks (
+            profile_id INTEGER NOT NULL REFERENCES profiles(id),
+            section INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            PRIMARY KEY (profile_id, section, level)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY,
+            profile_id INTEGER NOT NULL REFERENCES profiles(id),
+            section INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            seconds REAL NOT NULL,
+            solved INTEGER NOT NULL,
+            counter_example TEXT
+        );
+        CREATE INDEX IF NOT EXISTS attempts_by_level ON attempts (profile_id, section, level);
+        CREATE TABLE IF NOT EXISTS level_stats (
+            profile_id INTEGER NOT NULL REFERENCES profiles(id),
+            section INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            checks INTEGER NOT NULL,
+            solves INTEGER NOT NULL,
+            best_seconds REAL,
+            PRIMARY KEY (profile_id, section, level)
+        ) WITHOUT ROWID;
+    """
+
+    # statements are constant, so sqlite compiles each of them once and reuses it from its statement cache
+    _profile_id = "(SELECT id FROM profiles WHERE name = ?)"
+    _insert_profile = "INSERT OR IGNORE INTO profiles (name) VALUES (?)"
+    _select_profiles = "SELECT name FROM profiles ORDER BY id"
+    _insert_unlock = f"INSERT OR IGNORE INTO unlocks VALUES ({_profile_id}, ?, ?)"
+    _select_unlocks = f"SELECT section, level FROM unlocks WHERE profile_id = {_profile_id}"
+    _insert_attempt = f"""INSERT INTO attempts (profile_id, section, level, seconds, solved, counter_example)
+                          VALUES ({_profile_id}, ?, ?, ?, ?, ?)"""
+    # stats are kept up to date with every attempt, so the menu never has to scan the attempts
+    _upsert_stats = """INSERT INTO level_stats
+                       VALUES ((SELECT id FROM profiles WHERE name = :profile), :section, :level,
+                               1, :solved, CASE WHEN :solved THEN :seconds END)
+                        ON CONFLICT (profile_id, section, level) DO UPDATE SET
+                            checks = checks + 1,
+                            solves = solves + excluded.solves,
+                            best_seconds = coalesce(min(best_seconds, excluded.best_seconds),
+                                                    best_seconds, excluded.best_seconds)"""
+    _select_stats = f"""SELECT section, level, checks, solves, best_seconds FROM level_stats
+                        WHERE profile_id = {_profile_id}"""
+    _select_counter_examples = f"""SELECT counter_example FROM attempts
+                                   WHERE profile_id = {_profile_id} AND section = ? AND level = ?
+                                   AND counter_example IS NOT NULL ORDER BY id DESC LIMIT ?"""
+
+    # writes which failed, e.g. on a full or locked disk, are tried again after this many seconds
+    _retry_seconds = 2.0
+    # tries of the failed writes when the game closes, before they are given up
+    _final_retries = 3
+
+    def __init__(self, path="levels/progress.db"):
+        """Creates store of the database at path. Its opened when first needed."""
+        self._path = path
+        # connection for reads, used only by the thread which opened it
+        self._connection = None
+        self._writes = queue.Queue()
+        self._writer = None
+
+    def _reader(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path)
+            # readers dont wait for the writer in write ahead log mode
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.executescript(self._schema)
+        return self._connection
+
+    def _read(self, statement, parameters):
+        """Runs the query after every queued write is done."""
+        connection = self._reader()
+        self._writes.join()
+        return connection.execute(statement, parameters).fetchall()
+
+    def _write(self, *statements):
+        """Queues statements, which are written together in one transaction."""
+        if self._writer is None:
+            self._reader()  # tables have to exist before the writer starts
+            self._writer = threading.Thread(target=self._write_batches, daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+        self._writes.put(statements)
+
+    def close(self):
+        """Writes everything still queued and stops the writer. Blocks until done."""
+        if self._writer is not None:
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _write_batches(self):
+        """Background thread writing queued statements, everything waiting at once in a single transaction."""
+        connection = sqlite3.connect(self._path)
+        # statements of batches which couldnt be written, in the order they were queued
+        failed = []
+        while True:
+            try:
+                batch = [self._writes.get(timeout=self._retry_seconds if failed else None)]
+            except queue.Empty:
+                batch = []  # nothing new, only the failed writes are tried again
+            while not self._writes.empty():
+                batch.append(self._writes.get())
+
+            # failed writes go first, so unlocks and attempts stay in order
+            failed = self._write_batch(connection, failed + [statements for statements in batch if statements])
+            for _ in batch:
+                self._writes.task_done()
+            if None in batch:
+                for _ in range(self._final_retries):
+                    if not failed:
+                        break
+                    time.sleep(self._retry_seconds)
+                    failed = self._write_batch(connection, failed)
+                if failed:
+                    logging.getLogger(__name__).error("progress store: %d writes lost", len(failed))
+                connection.close()
+                return
+
+    def _write_batch(self, connection, batch):
+        """Writes the statements of the batch in one transaction. Returns the batch if it failed, otherwise empty list."""
+        try:
+            with connection:
+                for statements in batch:
+                    for statement, parameters in statements:
+                        connection.execute(statement, parameters)
+            return []
+        except sqlite3.OperationalError as error:
+            # full, locked or failing disk. the transaction is rolled back as a whole, its tried again later
+            logging.getLogger(__name__).warning("progress store: writing %d batches failed: %s", len(batch), error)
+            telemetry.emit("progress_write_failed", error=str(error), pending=len(batch))
+            return batch
+        except sqlite3.Error as error:
+            # write which can never succeed, the others are written one by one without it
+            if len(batch) > 1:
+                return [statements for single in batch for statements in self._write_batch(connection, [single])]
+            logging.getLogger(__name__).error("progress store: write dropped: %s", error)
+            telemetry.emit("progress_write_dropped", error=str(error))
+            return []
+
+    def profiles(self):
+        """Returns names of all profiles, in order of creation."""
+        return [name for (name,) in self._read(self._select_profiles, ())]
+
+    def add_profile(self, name):
+        """Creates profile, if theres no profile with that name yet."""
+        self._write((self._insert_profile, (name,)))
+
+    def unlocked_levels(self, profile):
+        """Returns set of (section, level) unlocked by the profile."""
+        return set(self._read(self._select_unlocks, (profile,)))
+
+    def unlock(self, profile, section, level):
+        """Stores that the profile unlocked the level."""
+        self._write((self._insert_unlock, (profile, section, level)))
+
+    def unlock_many(self, profile, levels):
+        """Stores all (section, level) unlocked by the profile in one transaction."""
+        self._write(*[(self._insert_unlock, (profile, section, level)) for section, level in levels])
+
+    def record_attempt(self, profile, section, level, seconds, solved, counter_example=None):
+        """Stores one check of the player automaton, with the word it failed on if theres one."""
+        self._write((self._insert_attempt, (profile, section, level, seconds, int(solved), counter_example)),
+                    (self._upsert_stats, {"profile": profile, "section": section, "level": level,
+                                          "solved": int(solved), "seconds": seconds}))
+
+    def level_stats(self, profile):
+        """Returns (section, level) -> (checks, solves, best seconds or None) of the profile."""
+        return {(section, level): (checks, solves, best_seconds)
+                for section, level, checks, solves, best_seconds in self._read(self._select_stats, (profile,))}
+
+    def counter_examples(self, profile, section, level, limit=10):
+        """Returns the latest counter examples the profile has seen in the level, newest first."""
+        return [word for (word,) in self._read(self._select_counter_examples, (profile, section, level, limit))]
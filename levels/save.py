@@ -1,37 +1,134 @@
 import json
+import weakref
 
 
 class Save():
-    """Stores data about which levels the player unlocked."""
+    """Stores data about which levels the player of the current profile unlocked.
 
-    def __init__(self, det_num, nondet_num):
-        """Makes save with the number of levels in each section."""
+    Progress in memory is authoritative, the progress store writes it to the database in the background."""
+
+    _default_profile = "player 1"
+
+    def __init__(self, catalogue, store, legacy_path="levels/saves.json"):
+        """Makes save with the sections and levels of the level catalogue, backed by the progress store."""
         self.unlocked_levels_data = None
-        self._det_num = det_num
-        self._nondet_num = nondet_num
+        self._catalogue = catalogue
+        self._store = store
+        self._legacy_path = legacy_path
+        self._profile = None
+        # set of unlocked (section, level), loaded when first needed
+        self._progress = None
+        # (section, level) -> (checks, solves, best seconds or None), loaded when first needed and then kept in memory
+        self._level_stats = None
+        # notified with progress_changed(unlocked_levels_data), dropped when nothing else references them
+        self._observers = weakref.WeakSet()
+
+    @property
+    def profile(self):
+        if self._profile is None:
+            profiles = self._store.profiles()
+            self._profile = profiles[0] if profiles else self._create_default_profile()
+        return self._profile
+
+    @property
+    def profiles(self):
+        self.profile  # the default profile is created first
+        return self._store.profiles()
+
+    def _create_default_profile(self):
+        """Creates the first profile, taking over progress from the saves file of older versions."""
+        self._store.add_profile(self._default_profile)
+        try:
+            with open(self._legacy_path, "r") as file:
+                file_dict = json.loads(file.read())
+        except (OSError, ValueError):
+            return self._default_profile
+
+        unlocked = [(int(section_key.split("_")[1]), int(level_key.split("_")[1]))
+                    for section_key, section_unlocks in file_dict.items()
+                    for level_key, unlocked in section_unlocks[0].items() if unlocked]
+        self._store.unlock_many(self._default_profile, unlocked)
+        return self._default_profile
+
+    def switch_profile(self, name):
+        """Switches to the profile, creating it if it doesnt exist."""
+        if name not in self.profiles:
+            self._store.add_profile(name)
+        self._profile = name
+        self._progress = None
+        self._level_stats = None
+        self._update_unlocked_levels_data()
+        self._notify()
+
+    def levels_changed(self):
+        """Rebuilds the data after sections or levels in the level catalogue changed."""
+        if self.unlocked_levels_data is not None:
+            self._update_unlocked_levels_data()
+            self._notify()
+
+    def add_observer(self, observer):
+        """Observer gets progress_changed(unlocked_levels_data) called whenever the progress changes."""
+        self._observers.add(observer)
+
+    def _notify(self):
+        for observer in list(self._observers):
+            observer.progress_changed(self.unlocked_levels_data)
+
+    def _get_progress(self):
+        """Reads the unlocked levels of the profile, only once."""
+        if self._progress is None:
+            self._progress = self._store.unlocked_levels(self.profile)
+        return self._progress
 
     def load_data(self):
-        """Initialises the data from the saves file."""
-        with open("levels/saves.json", "r") as file:
-            file_content = file.read()
-            file_dict = json.loads(file_content)
+        """Initialises the data from the progress, if it isnt already."""
+        if self.unlocked_levels_data is None:
+            self._update_unlocked_levels_data()
+
+    def _update_unlocked_levels_data(self):
+        """Builds the data from the progress. Section titles are followed by unlocks of their levels."""
+        progress = self._get_progress()
 
         data = []
-        data.append("det")
-        for num in range(1, self._det_num + 1):
-            data.append(file_dict[f"section_{0}"][0][f"level_{num}"])
-        data.append("nondet")
-        for num in range(1, self._nondet_num + 1):
-            data.append(file_dict[f"section_{1}"][0][f"level_{num}"])
+        first_section = self._catalogue.sections[0]
+        for section in self._catalogue.sections:
+            data.append(self._catalogue.section_title(section))
+            # the very first level is always unlocked
+            for num in range(1, self._catalogue.playable_level_count(section) + 1):
+                data.append((section, num) in progress or (section == first_section and num == 1))
 
         self.unlocked_levels_data = data
 
     def save_unlocked_level(self, section, level):
-        """Writes into saves file that the level in section is unlocked."""
-        with open("levels/saves.json", "r") as file:
-            file_content = file.read()
-            file_dict = json.loads(file_content)
-            file_dict[f"section_{section}"][0][f"level_{level}"] = True
-
-        with open("levels/saves.json", "w") as file:
-            json.dump(file_dict, file, indent=4)
+        """Marks the level in section unlocked. The change is written to disk in the background."""
+        progress = self._get_progress()
+        if (section, level) in progress:
+            return  # already unlocked, nothing to write
+        progress.add((section, level))
+        self._store.unlock(self.profile, section, level)
+
+        if self.unlocked_levels_data is not None:
+            self._update_unlocked_levels_data()
+            self._notify()
+
+    def record_attempt(self, section, level, seconds, solved, counter_example=None):
+        """Stores one check of the player automaton in the attempt history of the profile."""
+        self._store.record_attempt(self.profile, section, level, seconds, solved, counter_example)
+        if self._level_stats is not None:
+            # same update as the store does, so the menu never waits for the write
+            checks, solves, best_seconds = self._level_stats.get((section, level), (0, 0, None))
+            if solved:
+                best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+            self._level_stats[(section, level)] = (checks + 1, solves + int(solved), best_seconds)
+
+    def level_stats(self):
+        """Returns (section, level) -> (checks, solves, best seconds or None) of the profile.
+
+        Only the first call reads the store, which waits for the queued writes."""
+        if self._level_stats is None:
+            self._level_stats = self._store.level_stats(self.profile)
+        return dict(self._level_stats)
+
+    def close(self):
+        """Writes the progress still waiting in the background."""
+        self._store.close()
@@ -2,12 +2,12 @@ import pygame
 
 from draw_text import DrawText
 from config.global_vars import screen_height, screen_width, font, font_bold, color_dark, color_light
-from menu_variant import MainVariant, LevelVariant, ResolutionVariant, AudioVariant
+from menu_variant import MainVariant, LevelVariant, ProfileVariant, ResolutionVariant, AudioVariant
 # basis for menu from: https://www.youtube.com/watch?v=a5JWrd7Y_14&list=PLVFWKkB2K-TnsGDz7xrN27IpCU5I1bery
 
 
 class Menu(pygame.sprite.Sprite, DrawText):
-    """Menu with main, level, resolution and audio variants."""
+    """Menu with main, level, profile, resolution and audio variants."""
 
     def __init__(self, screen):
         """Creates and houses the variant of the menu. Initialises needed variables for opperation."""
@@ -47,6 +47,7 @@ class Menu(pygame.sprite.Sprite, DrawText):
             "game": lambda: self._handle_game(),
             "main": lambda: self._switch_variant("main"),
             "levels": lambda: self._switch_variant("levels"),
+            "profiles": lambda: self._switch_variant("profiles"),
             "resolution": lambda: self._switch_variant("resolution"),
             "audio": lambda: self._switch_variant("audio"),
             "1280x720": lambda: self._change_resolution((1280, 720), False),
@@ -93,6 +94,8 @@ class Menu(pygame.sprite.Sprite, DrawText):
                 self.variant_var = MainVariant(self)
             case "levels":
                 self.variant_var = LevelVariant(self)
+            case "profiles":
+                self.variant_var = ProfileVariant(self)
             case "resolution":
                 self.variant_var = ResolutionVariant(self)
             case "audio":
@@ -141,7 +144,8 @@ class Menu(pygame.sprite.Sprite, DrawText):
         height = height - (len(menu_items) * offset) // 2
         levels_passed = None
         if self.variant == "levels":
-            levels_passed = self.variant_var.load_levels()
+            # kept up to date by the save, so drawing doesnt touch the saves file
+            levels_passed = self.variant_var.save_data
             for elem in levels_passed:
                 elem = not elem
 
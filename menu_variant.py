@@ -42,7 +42,7 @@ class MainVariant(MenuVariant):
         self._variant = "main"
 
         self._mode = "levels"
-        self.modes = ["levels", "resolution", "audio", "quit game"]
+        self.modes = ["levels", "profiles", "resolution", "audio", "quit game"]
         self.mode_index = 0
 
     def handle_up(self):
@@ -72,39 +72,63 @@ class LevelVariant(MenuVariant):
         super().__init__(menu)
         self._variant = "levels"
 
-        self._mode = "1"
-        self.modes = ["deterministic", "1", "2", "3", "4",
-                      "nondeterministic", "1", "2", "3", "4"]
+        # level pack and save are shared by all file handlers, no file handler of its own is needed
+        self.catalogue = FileHandler.catalogue
+        self.save = FileHandler.save
         self.mode_index = 1
+        self._build_modes()
 
-        self.file_handler = FileHandler()
         self.save_data = self.load_levels()
+        self.save.add_observer(self)
 
         self.current_section = None
         self.current_level = None
 
+    def _build_modes(self):
+        """Builds menu items from the level catalogue, keeping the selected item if it still exists."""
+        catalogue = self.catalogue
+        # one indexed query of the per level statistics, not of the whole attempt history
+        level_stats = self.save.level_stats()
+
+        # section titles followed by level numbers. positions map menu items to (section, level), None for titles
+        self.modes = []
+        self._positions = []
+        for section in catalogue.sections:
+            self.modes.append(catalogue.section_title(section))
+            self._positions.append(None)
+            for level in range(1, catalogue.playable_level_count(section) + 1):
+                best_seconds = level_stats.get((section, level), (0, 0, None))[2]
+                self.modes.append(str(level) if best_seconds is None else f"{level}   best {best_seconds:.0f} s")
+                self._positions.append((section, level))
+        if self.mode_index >= len(self.modes) or self._positions[self.mode_index] is None:
+            self.mode_index = 1
+        self._mode = self.modes[self.mode_index]
+
     def load_levels(self):
         """Loads data on what levels the player unlocked."""
-        save = self.file_handler.load_unlocks()
-        self.save_data = save.unlocked_levels_data
-        return save.unlocked_levels_data
+        self.save.load_data()
+        self.save_data = self.save.unlocked_levels_data
+        return self.save.unlocked_levels_data
+
+    def progress_changed(self, unlocked_levels_data):
+        """Called by the save when a level gets unlocked, or levels were edited."""
+        self._build_modes()
+        self.save_data = unlocked_levels_data
+
+    def _move(self, step):
+        """Moves by step in menu items, looping around. Skips the titles of sections."""
+        self.mode_index = (self.mode_index + step) % len(self.modes)
+        while self._positions[self.mode_index] is None:
+            self.mode_index = (self.mode_index + step) % len(self.modes)
+        self._mode = self.modes[self.mode_index]
 
     def handle_up(self):
         """Go up in menu items. If at top, loop to the bottom. If at title of section, skip."""
-        if not (self._mode == "1"):
-            self.mode_index = (self.mode_index - 1) % len(self.modes)
-        else:  # skipping the section names
-            self.mode_index = (self.mode_index - 2) % len(self.modes)
-        self._mode = self.modes[self.mode_index]
+        self._move(-1)
 
     def handle_down(self):
         """Go down in menu items. If at bottom, loop to the top. If at the title of section, skip."""
-        last_level = str((len(self.modes) - 2) // 2)
-        if not (self._mode == last_level):
-            self.mode_index = (self.mode_index + 1) % len(self.modes)
-        else:  # skipping the section names
-            self.mode_index = (self.mode_index + 2) % len(self.modes)
-        self._mode = self.modes[self.mode_index]
+        self._move(1)
 
     def handle_esc(self):
         """Return action that should be handled if esc key is pressed."""
@@ -114,14 +138,47 @@ class LevelVariant(MenuVariant):
         """Switch to the selected level."""
         # if level is unlocked
         if self.save_data[self.mode_index]:
+            self.current_section, self.current_level = self._positions[self.mode_index]
+            return "game"
 
-            level_index = self.mode_index
-            level_count_per_section = (len(self.modes)) // 2
 
-            self.current_section = level_index // level_count_per_section
-            self.current_level = int(self._mode)
+class ProfileVariant(MenuVariant):
+    """Profile variant of the menu."""
 
-            return "game"
+    def __init__(self, menu):
+        """Initialises profile variant of the menu."""
+        super().__init__(menu)
+        self._variant = "profiles"
+
+        self.save = FileHandler.save
+        self.modes = self.save.profiles + ["new profile"]
+        self.mode_index = self.modes.index(self.save.profile)
+        self._mode = self.modes[self.mode_index]
+
+    def handle_up(self):
+        """Go up in menu items. If at top, loop to the bottom."""
+        self.mode_index = (self.mode_index - 1) % len(self.modes)
+        self._mode = self.modes[self.mode_index]
+
+    def handle_down(self):
+        """Go down in menu items. If at bottom, loop to the top."""
+        self.mode_index = (self.mode_index + 1) % len(self.modes)
+        self._mode = self.modes[self.mode_index]
+
+    def handle_esc(self):
+        """Return to the main menu."""
+        return "main"
+
+    def handle_select(self):
+        """Switches to the selected profile, or creates a new one."""
+        if self._mode == "new profile":
+            number = len(self.modes)
+            while f"player {number}" in self.modes:
+                number += 1
+            self.save.switch_profile(f"player {number}")
+        else:
+            self.save.switch_profile(self._mode)
+        return "main"
 
 
 class ResolutionVariant(MenuVariant):
@@ -0,0 +1,88 @@
+from collections import deque
+
+
+def evaluate_expression(expression, level_accepts):
+    """Evaluates boolean expression over level languages. Expression is an index of level automaton, or ["and"/"or"/"not", ...]."""
+    if isinstance(expression, int):
+        return level_accepts[expression]
+
+    operator, operands = expression[0], expression[1:]
+    match operator:
+        case "and":
+            return all(evaluate_expression(operand, level_accepts) for operand in operands)
+        case "or":
+            return any(evaluate_expression(operand, level_accepts) for operand in operands)
+        case "not":
+            return not evaluate_expression(operands[0], level_accepts)
+    raise ValueError(f"Unknown operator in level goal: {operator}")
+
+
+def bounds_predicate(lower=None, upper=None):
+    """Makes acceptance predicate requiring lower ⊆ language of player ⊆ upper. Missing bound isnt checked."""
+    def predicate(player_accepts, level_accepts):
+        # returns whether the word should be accepted, or None if the word doesnt break the goal
+        if (lower is not None) and (not player_accepts) and evaluate_expression(lower, level_accepts):
+            return True
+        if (upper is not None) and player_accepts and (not evaluate_expression(upper, level_accepts)):
+            return False
+        return None
+    return predicate
+
+
+class MultiProductAutomaton():
+    """Lazy product of the player automaton and several level automata, checked by an acceptance predicate."""
+
+    def __init__(self, player_automaton, level_automata, predicate):
+        """Packs all automata, product states are only created when the search reaches them."""
+        self._player_a = player_automaton.compact()
+        self._level_a = [level_automaton.compact() for level_automaton in level_automata]
+        self._predicate = predicate
+
+    def find_counter_example(self):
+        """Searches for the shortest word breaking the predicate. Returns (word, should_accept), or True if there isnt any."""
+        # product state is the bitset of active player states and bitsets of active states of every level automaton
+        initial_state = (self._player_a.initial_mask,
+                         tuple(automaton.initial_mask for automaton in self._level_a))
+        queue = deque([(initial_state, "")])
+        visited = {initial_state}
+
+        while queue:
+            current_state, current_word = queue.popleft()
+
+            should_accept = self._predicate(*self._accepting(current_state))
+            if should_accept is not None:
+                return (current_word, should_accept)  # first violating word, stopping the search
+
+            for symbol in self._player_a.alphabet:
+                player_mask, level_masks = current_state
+                new_state = (self._player_a.step(player_mask, symbol),
+                             tuple(automaton.step(mask, symbol) for automaton, mask in zip(self._level_a, level_masks)))
+                if new_state not in visited:
+                    visited.add(new_state)
+                    queue.append((new_state, current_word + symbol))
+
+        return True  # the goal holds for every word
+
+    def _accepting(self, current_state):
+        """Returns whether the player automaton and each level automaton accept in the product state."""
+        player_mask, level_masks = current_state
+        player_accepts = bool(player_mask & self._player_a.accepting_mask)
+        level_accepts = tuple(bool(mask & automaton.accepting_mask)
+                              for automaton, mask in zip(self._level_a, level_masks))
+        return player_accepts, level_accepts
+
+
+class LevelGoal():
+    """Goal of a level given by bounds over boolean combination of level languages."""
+
+    def __init__(self, automata, lower=None, upper=None):
+        """Creates goal from level automata and lower and upper bound expressions."""
+        self.automata = automata
+        self.lower = lower
+        self.upper = upper
+
+    def check(self, player_automaton):
+        """Checks the player automaton against the goal. Returns True, or the offending word like ProductAutomaton."""
+        product_automaton = MultiProductAutomaton(
+            player_automaton, self.automata, bounds_predicate(self.lower, self.upper))
+        return product_automaton.find_counter_example()
@@ -1,20 +1,41 @@
 import pygame
 
 from objects.arrow_variant import StraightVariant, LoopVariant
+from objects.spatial_group import SpatialGroup
 
 class Arrow(pygame.sprite.Sprite):
     """Arrow with symbols."""
 
+    # sound effects are shared by all arrows, loaded when the first arrow is created
+    symbol_add = None
+    symbol_remove = None
+
     def __init__(self, point_1, point_2):
         """Creates, materialises and houses the variant of the arrow."""
         pygame.sprite.Sprite.__init__(self)
         # point_1 = (x,y) the arrow is defined by a list of points, not by x, y coordinates, so it doesn't inherit from Object
         self.variant_var = StraightVariant([point_1, point_2])
-        self._materialisation()
+        self._load_sounds()
+
+    @classmethod
+    def from_transition(cls, point_1, point_2, symbols):
+        """Creates finished arrow with its symbols. Arrow from a point to the same point is a loop."""
+        arrow = cls.__new__(cls)
+        pygame.sprite.Sprite.__init__(arrow)
+        # variant is created with the symbols already in it, so the arrow is materialised only once
+        if point_1 == point_2:
+            arrow.variant_var = LoopVariant([point_1], symbols)
+        else:
+            arrow.variant_var = StraightVariant([point_1, point_2], symbols)
+        arrow._load_sounds()
+        return arrow
 
-        # sound effects
-        self.symbol_add = pygame.mixer.Sound("sounds/symbol_add.mp3")
-        self.symbol_remove = pygame.mixer.Sound("sounds/symbol_remove.mp3")
+    @classmethod
+    def _load_sounds(cls):
+        """Loads sound effects once for the whole class."""
+        if cls.symbol_add is None:
+            cls.symbol_add = pygame.mixer.Sound("sounds/symbol_add.mp3")
+            cls.symbol_remove = pygame.mixer.Sound("sounds/symbol_remove.mp3")
 
     @property
     def variant(self):
@@ -38,7 +59,7 @@ class Arrow(pygame.sprite.Sprite):
 
     @property
     def mask(self):
-        return self.variant_var._mask
+        return self.variant_var.mask
 
     def switch_variant(self, new_variant):
         """Switches variant of the arrow according to the selected new variant."""
@@ -49,12 +70,12 @@ class Arrow(pygame.sprite.Sprite):
                 self.variant_var = StraightVariant(points)
             case "loop":
                 self.variant_var = LoopVariant(points)
-
-        self._materialisation()
+        SpatialGroup.sprite_moved(self)
 
     def _materialisation(self):
-        """Materialises the full arrow, from its parts."""
+        """Materialises the full arrow, from its parts. Its rect changes, so its moved in the spatial groups."""
         self.variant_var._materialisation()
+        SpatialGroup.sprite_moved(self)
 
     def update_symbol(self, symbol):
         """Handles adding or removing symbol. If there is already symbol its removed. If not, its added."""
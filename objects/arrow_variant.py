@@ -2,6 +2,7 @@ import pygame
 import math
 
 from abc import ABC, abstractmethod
+from asset_cache import AssetCache
 from draw_text import DrawText
 from config.global_vars import color_normal, color_dark, font
 
@@ -9,16 +10,25 @@ from config.global_vars import color_normal, color_dark, font
 class ArrowVariant(ABC, DrawText):
     """Describes what attributes and methods should an arrow variant have."""
 
-    def __init__(self):
-        """Initialises a blank arrow."""
+    __slots__ = ("_variant", "_symbols", "_points", "_image", "_rect", "_mask")
+
+    def __init__(self, symbols=None):
+        """Initialises a blank arrow, or arrow with the given symbols."""
         self._variant = None
-        self._symbols = []
+        self._symbols = list(symbols) if symbols else []
         # both implementations use different number of points, initialising as none
         self._points = None
         self._image = None
         self._rect = None
         self._mask = None
 
+    @property
+    def mask(self):
+        """Mask is built only when collision needs it, not every time the arrow is redrawn."""
+        if self._mask is None:
+            self._mask = pygame.mask.from_surface(self._image)
+        return self._mask
+
     @abstractmethod
     def _materialisation(self):
         pass
@@ -35,9 +45,11 @@ class ArrowVariant(ABC, DrawText):
 class StraightVariant(ArrowVariant):
     """Straight variant of the arrow. Represents transition from one circle to the next."""
 
-    def __init__(self, points):
-        """Create and materialise a blank straight arrow."""
-        super().__init__()
+    __slots__ = ()
+
+    def __init__(self, points, symbols=None):
+        """Create and materialise a straight arrow, blank or with the given symbols."""
+        super().__init__(symbols)
         self._variant = "straight"
         self._points = points
         self._materialisation()
@@ -52,7 +64,7 @@ class StraightVariant(ArrowVariant):
 
         # making new surface for drawing arrow on. adding aditional padding, so arrow wont get cut off
         self._image = pygame.Surface(
-            (width + padding, height + padding), pygame.SRCALPHA).convert_alpha()
+            (width + padding, height + padding), pygame.SRCALPHA)
 
         # finding coordinates of top left corner to start drawing process corectly
         origin_x = min(x1, x2)
@@ -84,7 +96,7 @@ class StraightVariant(ArrowVariant):
         # removing padding makes the arrow appear to start at the circle (if padding left in, the surface would start from the circle, making the arrow look shifted)
         self._rect = self._image.get_rect(
             topleft=(origin_x - padding, origin_y - padding))
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = None
 
     def _calculate_offset_points(self, base_point, tip_point):
         """Calculates new points offset from the base and tip points at given angle and radius."""
@@ -142,7 +154,7 @@ class StraightVariant(ArrowVariant):
 
         # making arrowhead be its own surface, so it can be rotated independantly from the line of the arrow
         arrowhead_surface = pygame.Surface(
-            (tip_offset,  side_offset * 2), pygame.SRCALPHA).convert_alpha()
+            (tip_offset,  side_offset * 2), pygame.SRCALPHA)
 
         # drawing the arrowhead on the surface and rotating
         pygame.draw.polygon(arrowhead_surface, color_normal, arrowhead)
@@ -207,12 +219,13 @@ class StraightVariant(ArrowVariant):
 class LoopVariant(ArrowVariant):
     """Loop variant of the arrow. Represents transition from one state to the same one."""
 
-    def __init__(self, points):
-        """Create and materialise a blank Loop arrow."""
-        super().__init__()
+    __slots__ = ()
+
+    def __init__(self, points, symbols=None):
+        """Create and materialise a Loop arrow, blank or with the given symbols."""
+        super().__init__(symbols)
         self._variant = "loop"
-        self._image = pygame.image.load(
-            "assets/loop_arrow.png").convert_alpha()
+        self._image = AssetCache.image("assets/loop_arrow.png")
 
         new_point = points[0]
         # adjusting y height, so that arrow is on top of the circle
@@ -222,12 +235,11 @@ class LoopVariant(ArrowVariant):
         self._materialisation()
 
     def _materialisation(self):
-        """Loads a picture of the loop arrow and draws it with symbols."""
+        """Draws the picture of the loop arrow with symbols."""
         # make bigger surface, so multiple symbols wont get cut off when blitting
         bigger_surface = pygame.Surface((120, 50), pygame.SRCALPHA)
-        # load new_image of arrow, so that the old symbols dont persist
-        loop_arrow = pygame.image.load("assets/loop_arrow.png").convert_alpha()
-        bigger_surface.blit(loop_arrow, (35, 0))
+        # shared picture is only blitted, so the old symbols dont persist
+        bigger_surface.blit(AssetCache.image("assets/loop_arrow.png"), (35, 0))
         self._image = bigger_surface
 
         symbols = ", ".join(self._symbols)
@@ -235,7 +247,7 @@ class LoopVariant(ArrowVariant):
 
         # updating the position of the rectangle
         self._rect = self._image.get_rect(midbottom=self._points[0])
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = None
 
     def add_symbol(self, symbol):
         """Adds symbol to the arrow and visualises the change."""
@@ -0,0 +1,66 @@
+try:
+    import numpy as np
+except ImportError:  # layout is an optional feature, the game runs without numpy
+    np = None
+
+
+class AutoLayout():
+    """Force directed layout of the circles on the board. Circles repel each other, arrows pull them together like springs."""
+
+    def __init__(self, iterations=80):
+        """Creates layout running the given number of iterations."""
+        self.iterations = iterations
+
+    @property
+    def available(self):
+        return np is not None
+
+    def bounds(self, width, height):
+        """Returns area where the circles can be placed, same as where the player can walk."""
+        # matches the bounds in Player.movement, so every circle stays reachable
+        x_offset = 100
+        y_offset = 150
+        return x_offset, y_offset, width - x_offset, height - y_offset
+
+    def layout(self, positions, edges, bounds):
+        """Returns new positions. Positions is a list of (x, y), edges are pairs of indices into positions."""
+        left_edge, top_edge, right_edge, bottom_edge = bounds
+        count = len(positions)
+        if count == 0:
+            return []
+
+        points = np.array(positions, dtype=np.float64)
+        # tiny deterministic jitter, so circles on the same spot can be pushed apart
+        points += np.random.default_rng(0).uniform(-1, 1, points.shape)
+        edges = np.array([edge for edge in edges if edge[0] != edge[1]], dtype=np.intp).reshape(-1, 2)
+
+        area = (right_edge - left_edge) * (bottom_edge - top_edge)
+        ideal_distance = np.sqrt(area / count)  # ideal distance between circles
+        temperature = (right_edge - left_edge) / 10  # maximal movement in one iteration, cools down
+        cooling = temperature / (self.iterations + 1)
+
+        for _ in range(self.iterations):
+            # repulsion between all pairs of circles at once. force k^2 / d along the unit vector is delta * k^2 / d^2,
+            # so summing it over all pairs is a single matrix product with weights 1 / d^2
+            delta_x = points[:, 0, None] - points[None, :, 0]
+            delta_y = points[:, 1, None] - points[None, :, 1]
+            weights = 1 / np.maximum(delta_x ** 2 + delta_y ** 2, 0.01)
+            np.fill_diagonal(weights, 0)
+            displacement = (ideal_distance ** 2) * (points * weights.sum(axis=1)[:, None] - weights @ points)
+
+            # springs of the arrows
+            if len(edges):
+                edge_delta = points[edges[:, 0]] - points[edges[:, 1]]
+                edge_distance = np.maximum(np.sqrt((edge_delta ** 2).sum(axis=-1)), 0.01)
+                attraction = edge_delta / edge_distance[:, None] * (edge_distance ** 2 / ideal_distance)[:, None]
+                np.subtract.at(displacement, edges[:, 0], attraction)
+                np.add.at(displacement, edges[:, 1], attraction)
+
+            # moving at most by temperature, staying inside the bounds
+            length = np.maximum(np.sqrt((displacement ** 2).sum(axis=-1)), 0.01)
+            points += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+            points[:, 0] = np.clip(points[:, 0], left_edge, right_edge)
+            points[:, 1] = np.clip(points[:, 1], top_edge, bottom_edge)
+            temperature -= cooling
+
+        return [tuple(point) for point in points.tolist()]
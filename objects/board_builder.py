@@ -0,0 +1,85 @@
+import math
+
+from objects.arrow import Arrow
+from objects.circle import Circle
+
+
+class BoardBuilder():
+    """Turns a whole automaton into circles and arrows in one batch."""
+
+    def build(self, automaton, target_automaton, circle_group, arrow_group, positions=None, bounds=(1280, 720)):
+        """Creates circles and arrows of the automaton and copies its states and transitions into target_automaton.
+
+        Positions map state numbers to (x, y). States without position are placed on a grid inside bounds.
+        Returns the number of the next circle, so the circle generator can continue numbering."""
+        states = automaton._collect_states()
+        # circles are numbered by ints, determinised automata have tuples of states instead
+        if all(isinstance(state, int) for state in states):
+            numbers = {state: state for state in states}
+        else:
+            numbers = {state: index for index, state in enumerate(states)}
+        positions = positions or {}
+        grid_positions = self._grid_positions(len(states), bounds)
+
+        circles = {}
+        for index, state in enumerate(states):
+            number = numbers[state]
+            initial = state in automaton.initial_states
+            accepting = state in automaton.accepting_states
+            if initial and accepting:
+                variant = "initial_accepting"
+            elif initial:
+                variant = "initial"
+            elif accepting:
+                variant = "accepting"
+            else:
+                variant = "base"
+
+            x, y = positions.get(number, grid_positions[index])
+            circles[number] = Circle(x, y, number, variant)
+
+        # one arrow between two circles, holding all the symbols of transitions between them
+        arrow_symbols = {}
+        for state_from, transitions in automaton.transition_dict.items():
+            for symbols, state_to in transitions:
+                pair_symbols = arrow_symbols.setdefault(
+                    (numbers[state_from], numbers[state_to]), [])
+                pair_symbols.extend(symbol for symbol in symbols if symbol not in pair_symbols)
+
+        transition_dict = {}
+        for (number_from, number_to), symbols in arrow_symbols.items():
+            transition_dict.setdefault(number_from, []).append([symbols, number_to])
+
+        target_automaton.initial_states = [numbers[state] for state in automaton.initial_states]
+        target_automaton.accepting_states = [numbers[state] for state in automaton.accepting_states]
+        target_automaton.transition_dict = transition_dict
+
+        circle_group.add(*circles.values())
+        self.build_arrows(transition_dict, circles, arrow_group)
+        return max(circles, default=-1) + 1
+
+    def build_arrows(self, transition_dict, circles, arrow_group):
+        """Creates arrow for every transition between the circles, circles maps numbers to circles."""
+        arrows = []
+        for number_from, transitions in transition_dict.items():
+            for symbols, number_to in transitions:
+                arrows.append(Arrow.from_transition(circles[number_from].rect.center,
+                                                    circles[number_to].rect.center, symbols))
+        arrow_group.add(*arrows)
+
+    def _grid_positions(self, count, bounds):
+        """Spreads count positions evenly on a grid inside the area where the player can walk."""
+        x_offset = 150
+        y_offset = 200
+        width = bounds[0] - 2 * x_offset
+        height = bounds[1] - 2 * y_offset
+        columns = max(1, math.ceil(math.sqrt(count * width / max(height, 1))))
+        rows = max(1, math.ceil(count / columns))
+
+        positions = []
+        for index in range(count):
+            row, column = divmod(index, columns)
+            x = x_offset + (column + 0.5) * width / columns
+            y = y_offset + (row + 0.5) * height / rows
+            positions.append((x, y))
+        return positions
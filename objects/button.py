@@ -1,12 +1,19 @@
+import time
+
 import pygame
 
 from objects.button_variant import PressedVariant, UnpressedVariant
 from objects.object import Object
+from telemetry import telemetry
+from verdict_cache import VerdictCache
 
 
 class Button(pygame.sprite.DirtySprite, Object):
     """Button with pressed and unpressed variants."""
 
+    # verdicts are shared by all buttons, so they outlive the game screen and a level visited again
+    verdict_cache = VerdictCache()
+
     def __init__(self, x, y):
         """Creates and houses the variant of the button."""
         pygame.sprite.DirtySprite.__init__(self)
@@ -42,13 +49,28 @@ class Button(pygame.sprite.DirtySprite, Object):
     def mask(self):
         return self.variant_var._mask
 
-    def button_pressed(self, player_automaton, level_automaton):
+    def button_pressed(self, player_automaton, level_automaton, level_goal=None, level_suite=None, level_language=None):
         """Calls the variant's method with both automata."""
-        automaton_response = self.variant_var.button_pressed(player_automaton, level_automaton)
+        telemetry.emit("check_requested")
+        start = time.perf_counter()
+        hits = self.verdict_cache.hits
+        automaton_response = self.variant_var.button_pressed(
+            player_automaton, level_automaton, level_goal, level_suite, level_language)
+        telemetry.emit("check", latency_ms=(time.perf_counter() - start) * 1000,
+                       cached=self.verdict_cache.hits > hits, **self._verdict_fields(automaton_response))
 
         if automaton_response is True:
             pygame.mixer.Channel(1).play(self.automaton_accepts)
         else:
             pygame.mixer.Channel(1).play(self.automaton_rejects)
 
-        return automaton_response
\ No newline at end of file
+        return automaton_response
+
+    @staticmethod
+    def _verdict_fields(automaton_response):
+        """Describes the response of the automaton for telemetry."""
+        if automaton_response is True:
+            return {"verdict": "accepted"}
+        if isinstance(automaton_response, tuple):
+            return {"verdict": "rejected", "counter_example_length": len(automaton_response[0])}
+        return {"verdict": "error", "error": automaton_response}
\ No newline at end of file
@@ -1,6 +1,5 @@
-import pygame
-
 from abc import ABC
+from asset_cache import AssetCache
 
 
 class ButtonVariant(ABC):
@@ -22,10 +21,9 @@ class UnpressedVariant(ButtonVariant):
         """Creates and visualises an unpressed variant of the button."""
         super().__init__(button)
         self._variant = "unpressed"
-        self._image = pygame.image.load(
-            "assets/button_unpressed.png").convert_alpha()
+        self._image = AssetCache.image("assets/button_unpressed.png")
         self._rect = self._image.get_rect(center=(button.x, button.y))
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = AssetCache.mask("assets/button_unpressed.png")
 
 
 class PressedVariant(ButtonVariant):
@@ -35,11 +33,18 @@ class PressedVariant(ButtonVariant):
         """Creates and visualises a pressed variant of the button."""
         super().__init__(button)
         self._variant = "pressed"
-        self._image = pygame.image.load(
-            "assets/button_pressed.png").convert_alpha()
+        self._image = AssetCache.image("assets/button_pressed.png")
         self._rect = self._image.get_rect(center=(button.x, button.y))
-        self._mask = pygame.mask.from_surface(self._image)
+        self._mask = AssetCache.mask("assets/button_pressed.png")
+
+    def button_pressed(self, player_automaton, level_automaton, level_goal=None, level_suite=None, level_language=None):
+        """Calls the player automaton's method for checking the language equivalence with the level automaton.
+
+        With level_language (form, signature) of the level, the verdict comes from the cache if the player
+        already checked the same language, e.g. after rebuilding or only moving the board."""
+        def check_language(automaton):
+            return automaton.handle_checking_language(level_automaton, level_goal, level_suite)
 
-    def button_pressed(self, player_automaton, level_automaton):
-        """Calls the player automaton's method for checking the language equivalence with the level automaton."""
-        return player_automaton.handle_checking_language(level_automaton)
+        if level_language is None:
+            return check_language(player_automaton)
+        return self.button.verdict_cache.check(player_automaton, *level_language, check_language)
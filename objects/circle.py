@@ -2,16 +2,29 @@ import pygame
 
 from objects.circle_variant import BaseVariant, InitialVariant, AcceptingVariant, InitialAcceptingVariant
 from objects.object import Object
+from objects.spatial_group import SpatialGroup
 
 
 class Circle(pygame.sprite.Sprite, Object):
     """Circle with base, accepting, initial and initial accepting variants."""
 
-    def __init__(self, x, y, number):
+    variant_classes = {
+        "base": BaseVariant,
+        "initial": InitialVariant,
+        "accepting": AcceptingVariant,
+        "initial_accepting": InitialAcceptingVariant
+    }
+
+    def __init__(self, x, y, number, variant="base"):
         """Creates and houses the variant of the circle."""
         pygame.sprite.Sprite.__init__(self)
         Object.__init__(self, x, y)
-        self.variant_var = BaseVariant(self, number)
+        self.variant_var = self.variant_classes[variant](self, number)
+
+    def position_update(self, new_x, new_y, rect):
+        """Moves the circle, also in the grids of its spatial groups."""
+        Object.position_update(self, new_x, new_y, rect)
+        SpatialGroup.sprite_moved(self)
 
     def switch_variant(self, new_variant):
         """Switches variant of the circle according to the selected new variant."""
@@ -29,8 +29,7 @@ class CircleDestroyer(pygame.sprite.DirtySprite, Object):
         # initializing circle_arrows to ensure it is defined before next checks
         circle_arrows = None
         if target_circle:
-            circle_arrows = pygame.sprite.spritecollide(
-                target_circle, arrow_group, False, pygame.sprite.collide_mask)
+            circle_arrows = arrow_group.collide(target_circle)
 
             # checking if the circle doesnt have arrows connected to it
             if player_collision and (not circle_arrows):
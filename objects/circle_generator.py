@@ -40,8 +40,7 @@ class CircleGenerator(pygame.sprite.DirtySprite, Object):
         creation_circles = pygame.sprite.spritecollide(
             self, player_group, False, pygame.sprite.collide_mask)
 
-        circles = pygame.sprite.spritecollide(
-            player_group.sprite, circle_group, False, pygame.sprite.collide_mask)
+        circles = circle_group.collide(player_group.sprite)
 
         # add new circle if player isnt standing in creation circle already, and if no circles are present
         if creation_circles and (not circles):
@@ -1,4 +1,4 @@
-import pygame
+from asset_cache import AssetCache
 from config.global_vars import color_dark, font
 from draw_text import DrawText
 from abc import ABC
@@ -7,6 +7,8 @@ from abc import ABC
 class CircleVariant(ABC, DrawText):
     """Describes what attributes should a circle variant have."""
 
+    __slots__ = ("circle", "_number", "_variant", "_image", "_rect", "_mask")
+
     def __init__(self, circle, number):
         """Initialises a blank circle."""
         self.circle = circle  # circle is saved to the variable, so there is no duplicate data saved, only accessing circle for position data
@@ -16,71 +18,70 @@ class CircleVariant(ABC, DrawText):
         self._rect = None
         self._mask = None
 
+    def _materialisation(self, path):
+        """Draws the number on a copy of the circle image, the mask is shared by all circles of the variant."""
+        # shared image is copied, because the number is drawn on it
+        self._image = AssetCache.image_copy(path)
+        # variable called rect is needed for sprite group drawing
+        self._rect = self._image.get_rect(
+            center=(self.circle.x, self.circle.y))
+        self.draw_text_centered(self._image, str(
+            self._number), font, color_dark)
+        # the number is drawn inside of the circle, so the shape of the mask is the same for every number
+        self._mask = AssetCache.mask(path)
+
 
 class BaseVariant(CircleVariant):
     """Base variant of the circle."""
 
+    __slots__ = ()
+
+    image_path = "assets/circle_base.png"
+
     def __init__(self, circle, number):
         """Creates and visualises a base variant of the circle."""
         super().__init__(circle, number)
         self._variant = "base"
-        # load image #making image the desired size
-        self._image = pygame.image.load(
-            "assets/circle_base.png").convert_alpha()
-        # variable called rect is needed for sprite group drawing
-        self._rect = self._image.get_rect(
-            center=(self.circle.x, self.circle.y))
-        self.draw_text_centered(self._image, str(
-            self._number), font, color_dark)
-        self._mask = pygame.mask.from_surface(self._image)
+        self._materialisation(self.image_path)
 
 
 class InitialVariant(CircleVariant):
     """Initial variant of the circle."""
 
+    __slots__ = ()
+
+    image_path = "assets/circle_initial.png"
+
     def __init__(self, circle, number):
         """Creates and visualises an initial variant of the circle."""
         super().__init__(circle, number)
         self._variant = "initial"
-
-        self._image = pygame.image.load(
-            "assets/circle_initial.png").convert_alpha()
-        self._rect = self._image.get_rect(
-            center=(self.circle.x, self.circle.y))
-        self.draw_text_centered(self._image, str(
-            self._number), font, color_dark)
-        self._mask = pygame.mask.from_surface(self._image)
+        self._materialisation(self.image_path)
 
 
 class AcceptingVariant(CircleVariant):
     """Accepting variant of the circle."""
 
+    __slots__ = ()
+
+    image_path = "assets/circle_accepting.png"
+
     def __init__(self, circle, number):
         """Creates and visualises an accepting variant of the circle."""
         super().__init__(circle, number)
         self._variant = "accepting"
-
-        self._image = pygame.image.load(
-            "assets/circle_accepting.png").convert_alpha()
-        self._rect = self._image.get_rect(
-            center=(self.circle.x, self.circle.y))
-        self.draw_text_centered(self._image, str(
-            self._number), font, color_dark)
-        self._mask = pygame.mask.from_surface(self._image)
+        self._materialisation(self.image_path)
 
 
 class InitialAcceptingVariant(CircleVariant):
     """Initial and accepting variant of the circle."""
 
+    __slots__ = ()
+
+    image_path = "assets/circle_initial_accepting.png"
+
     def __init__(self, circle, number):
         """Creates and visualises an initial accepting variant of the circle."""
         super().__init__(circle, number)
         self._variant = "initial_accepting"
-
-        self._image = pygame.image.load(
-            "assets/circle_initial_accepting.png").convert_alpha()
-        self._rect = self._image.get_rect(
-            center=(self.circle.x, self.circle.y))
-        self.draw_text_centered(self._image, str(
-            self._number), font, color_dark)
-        self._mask = pygame.mask.from_surface(self._image)
+        self._materialisation(self.image_path)
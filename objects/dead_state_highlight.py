@@ -0,0 +1,20 @@
+from asset_cache import AssetCache
+from config.global_vars import color_dark
+
+
+class DeadStateHighlight():
+    """Marks circles that can never reach an accepting state."""
+
+    def __init__(self):
+        """Creates the cached mark drawn over dead circles."""
+        self._mark = AssetCache.highlight((*color_dark, 110))
+
+    def blit_sequence(self, circle_group, automaton):
+        """Returns (mark, rect) over every dead circle. The analysis is only recomputed when the automaton changed."""
+        # without any accepting state every circle would be dead, marking them all wouldnt help the player
+        if not automaton.accepting_states:
+            return []
+
+        analysis = automaton.analysis
+        return [(self._mark, self._mark.get_rect(center=circle.rect.center))
+                for circle in circle_group if analysis.is_dead(circle.number)]
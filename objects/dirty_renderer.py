@@ -0,0 +1,57 @@
+import pygame
+
+
+class DirtyRenderer():
+    """Redraws and updates only the parts of the screen, which changed since the previous frame."""
+
+    # with more changed parts than this, they are joined into one
+    _max_dirty_rects = 32
+
+    def __init__(self):
+        """Creates renderer, its first frame is drawn whole."""
+        # (image, rect) drawn in the previous frame, the images are kept so their ids cant be reused by new images
+        self._previous = set()
+        self._background = None
+        self._screen_size = None
+        self._redraw_all = True
+
+    def invalidate(self):
+        """Draws the whole next frame, e.g. after something else drew over the screen."""
+        self._redraw_all = True
+
+    def render(self, screen, background, blit_sequence):
+        """Draws background and the (image, rect) pairs in order, but only where some image appeared, moved or vanished."""
+        current = {(image, tuple(rect)) for image, rect in blit_sequence}
+        if self._redraw_all or background is not self._background or screen.get_size() != self._screen_size:
+            dirty_rects = [screen.get_rect()]
+        else:
+            # images which arent at the same place as in the previous frame, or arent there anymore
+            dirty_rects = self._merge([pygame.Rect(rect) for _, rect in current ^ self._previous])
+        self._previous = current
+        self._background = background
+        self._screen_size = screen.get_size()
+        self._redraw_all = False
+        if not dirty_rects:
+            return  # nothing changed, the screen stays as it is
+
+        for dirty_rect in dirty_rects:
+            # images are clipped to the changed part, the rest of the screen is still correct
+            screen.set_clip(dirty_rect)
+            screen.blit(background, dirty_rect, dirty_rect)
+            screen.blits([(image, rect) for image, rect in blit_sequence if dirty_rect.colliderect(rect)],
+                         doreturn=False)
+        screen.set_clip(None)
+        pygame.display.update(dirty_rects)
+
+    def _merge(self, rects):
+        """Joins overlapping rects, so no part of the screen is drawn twice."""
+        merged = []
+        for rect in rects:
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        if len(merged) > self._max_dirty_rects:
+            return [merged[0].unionall(merged[1:])]
+        return merged
@@ -25,6 +25,9 @@ class Environment(pygame.sprite.Sprite, DrawText):
 
         self.mask = pygame.mask.from_surface(self.image)
         self._input_language = None
+        # background with the input language, composed again only when one of them changes
+        self._background = None
+        self._background_key = None
 
     @property
     def input_language(self):
@@ -40,10 +43,17 @@ class Environment(pygame.sprite.Sprite, DrawText):
         x_middle = width / 2
         y_offset = 20
 
-        # redrawing the text every frame, so it stays on the screen
         self.draw_text(screen, self.input_language,
                        font, color_light, x_middle, height - y_offset)
 
+    def background(self):
+        """Returns the current image with the input language drawn on it."""
+        if self._background_key != (self.image, self._input_language):
+            self._background = self.image.copy()
+            self.draw_input_language(self._background)
+            self._background_key = (self.image, self._input_language)
+        return self._background
+
     def change_image(self, new_image):
         """Changes the image of the game's background."""
         if new_image == "environment":
@@ -23,10 +23,14 @@ class HelperDialogue(pygame.sprite.DirtySprite, Object, DrawText):
         backgroung_surface.blit(self._helper_image, (0, 0))
         backgroung_surface.blit(self._speech_bubble_image, (100, 0))
 
-        self.image = backgroung_surface
+        # kept clean, every text is drawn on a new copy of it
+        self._background_surface = backgroung_surface
+        self.image = backgroung_surface.copy()
         self.rect = self.image.get_rect(center=(x, y))
         self.mask = pygame.mask.from_surface(self.image)
 
+        # text currently drawn in the speech bubble
+        self._shown_text = None
         self._level_text_lines = []
         self._level_line_max = 0
         self._level_line_index = 0
@@ -83,14 +87,19 @@ class HelperDialogue(pygame.sprite.DirtySprite, Object, DrawText):
 
         self._draw_text_lines(self._level_text_lines, self._level_line_index)
 
+    def draw_message(self, text):
+        """Displays a message of the game itself, e.g. why the levels file wasnt reloaded."""
+        self._draw_text_lines([text], 0)
+
     def _draw_text_lines(self, text, line_index):
         """Draws line of text. If the line is too long, it gets split up to fit the speech bubble."""
-        # wiping clean and drawing background again, so the old text doesnt persist
-        self.image.fill((0, 0, 0, 0))
-        self.image.blit(self._helper_image, (0, 0))
-        self.image.blit(self._speech_bubble_image, (100, 0))
-
         current_text = text[line_index]
+        if current_text == self._shown_text:
+            return  # bubble already shows it, e.g. verdict drawn every frame
+        self._shown_text = current_text
+
+        # new copy of the clean background, so the old text doesnt persist and the renderer sees the image changed
+        self.image = self._background_surface.copy()
         # splitting text without splitting word from: https://stackoverflow.com/questions/56653871/split-string-every-n-characters-but-without-splitting-a-word/56653996
         max_length = 67
         split_text = wrap(current_text, max_length) if (
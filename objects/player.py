@@ -8,6 +8,25 @@ from objects.object import Object
 class Player(pygame.sprite.Sprite, Object):
     """Represents the playable character. Stores data related to making circles and arrows."""
 
+    # sound effects are shared by the class, loaded when the first player is created
+    circle_pick_up = None
+    circle_put_down = None
+    arrow_start = None
+    arrow_end = None
+
+    # direction of movement -> action of the player
+    _action_dict = {
+        (-1, 0): "run_left",
+        (1, 0): "run_right",
+        (0, -1): "run_left",
+        (0, 1): "run_right",
+        (-0.7, -0.7): "run_left",
+        (-0.7, 0.7): "run_left",
+        (0.7, -0.7): "run_right",
+        (0.7, 0.7): "run_right",
+        (0, 0): "stand"
+    }
+
     def __init__(self, x, y):
         """Creates player at the given coordinates. Initialises needed variables and flags."""
         pygame.sprite.Sprite.__init__(self)
@@ -25,11 +44,7 @@ class Player(pygame.sprite.Sprite, Object):
         self._carrying_circle = None
         self._current_arrow = None
 
-        # sound effects
-        self.circle_pick_up = pygame.mixer.Sound("sounds/circle_pick_up.mp3")
-        self.circle_put_down = pygame.mixer.Sound("sounds/circle_put_down.mp3")
-        self.arrow_start = pygame.mixer.Sound("sounds/arrow_start.mp3")
-        self.arrow_end = pygame.mixer.Sound("sounds/arrow_end.mp3")
+        self._load_sounds()
 
         # animation
         self._last_updated = pygame.time.get_ticks()
@@ -38,17 +53,14 @@ class Player(pygame.sprite.Sprite, Object):
         self._action = 1
         self._animation_init()
 
-        self._action_dict = {
-            (-1, 0): "run_left",
-            (1, 0): "run_right",
-            (0, -1): "run_left",
-            (0, 1): "run_right",
-            (-0.7, -0.7): "run_left",
-            (-0.7, 0.7): "run_left",
-            (0.7, -0.7): "run_right",
-            (0.7, 0.7): "run_right",
-            (0, 0): "stand"
-        }
+    @classmethod
+    def _load_sounds(cls):
+        """Loads sound effects once for the whole class."""
+        if cls.circle_pick_up is None:
+            cls.circle_pick_up = pygame.mixer.Sound("sounds/circle_pick_up.mp3")
+            cls.circle_put_down = pygame.mixer.Sound("sounds/circle_put_down.mp3")
+            cls.arrow_start = pygame.mixer.Sound("sounds/arrow_start.mp3")
+            cls.arrow_end = pygame.mixer.Sound("sounds/arrow_end.mp3")
 
     @property
     def carrying_circle(self):
@@ -134,16 +146,14 @@ class Player(pygame.sprite.Sprite, Object):
             self.carrying_circle = None
             pygame.mixer.Channel(1).play(self.circle_put_down)
         else:
-            circles = pygame.sprite.spritecollide(
-                self, cirlce_group, False, pygame.sprite.collide_mask)
+            circles = cirlce_group.collide(self)
             self.carrying_circle = circles[0] if circles else None
             if circles:
                 pygame.mixer.Channel(1).play(self.circle_pick_up)
 
     def handle_variant_change(self, automaton, circle_group):
         """Cycles through variants of circle. Also updates automaton's states."""
-        circles = pygame.sprite.spritecollide(
-            self, circle_group, False, pygame.sprite.collide_mask)
+        circles = circle_group.collide(self)
 
         circle_variant = circles[0].variant if circles else None
         match circle_variant:
@@ -164,8 +174,7 @@ class Player(pygame.sprite.Sprite, Object):
 
     def handle_arrow_creation(self, arrow_group, circle_group):
         """Handles creation of arrow."""
-        player_circles = pygame.sprite.spritecollide(
-            self, circle_group, False, pygame.sprite.collide_mask)
+        player_circles = circle_group.collide(self)
 
         # arrow is not already being created, and player is colliding with only one circle(making sure its clear which circle is circle from)
         if not self.current_arrow and len(player_circles) == 1:
@@ -191,8 +200,7 @@ class Player(pygame.sprite.Sprite, Object):
         if self._check_arrow_already_exists(arrow_group, circle_group, player_circles):
             return 0
 
-        arrow_circles = pygame.sprite.spritecollide(
-            self.current_arrow, circle_group, False, pygame.sprite.collide_mask)
+        arrow_circles = circle_group.collide(self.current_arrow)
         same_circle = pygame.Rect.collidepoint(
             player_circles[0].rect, self.current_arrow.points[0])
 
@@ -217,8 +225,7 @@ class Player(pygame.sprite.Sprite, Object):
         # checking what other arrows intersect circle_from
         potential_duplicates = []
         if circle_from:
-            potential_duplicates = pygame.sprite.spritecollide(
-                circle_from, arrow_group, False, pygame.sprite.collide_mask)
+            potential_duplicates = arrow_group.collide(circle_from)
         if potential_duplicates:
             potential_duplicates.remove(self.current_arrow)
 
@@ -249,8 +256,7 @@ class Player(pygame.sprite.Sprite, Object):
         # player is carrying a circle, and updating arrow associated with the circle too
         if self.carrying_circle:
             # there can be multiple arrows colliding with circle, not just the one player carries
-            arrow_circles = pygame.sprite.spritecollide(
-                self.carrying_circle, arrow_group, False, pygame.sprite.collide_mask)
+            arrow_circles = arrow_group.collide(self.carrying_circle)
 
             # saving position so that the arrow which collides with circle doesnt get left behind, when circle jumps away suddenly
             # without the copy, python updates the structure, even though the update happens out of the scope of this variable
@@ -261,11 +267,9 @@ class Player(pygame.sprite.Sprite, Object):
 
     def _update_circle(self, circle_group):
         """Updates circles to the players position."""
-        circle_circles = pygame.sprite.spritecollide(
-            self.carrying_circle, circle_group, False, pygame.sprite.collide_mask)
+        circle_circles = circle_group.collide(self.carrying_circle)
 
-        player_circles = pygame.sprite.spritecollide(
-            self, circle_group, False, pygame.sprite.collide_mask)
+        player_circles = circle_group.collide(self)
 
         # update only if circles arent on top of each other (ensures consistency when 2+ circles collide)
         if len(circle_circles) <= 1 or not player_circles:
@@ -0,0 +1,96 @@
+import pygame
+
+from asset_cache import AssetCache
+from config.global_vars import color_light, color_dark, font
+from draw_text import render_text
+
+
+class Simulation():
+    """Step through run of a typed word across the board. Highlights the active states after every symbol."""
+
+    def __init__(self):
+        """Creates simulation with cached highlight surface and no word."""
+        self.typing = False
+        self._word = ""
+        self._step_duration = 500  # miliseconds per symbol
+        self._symbol_keys = {pygame.K_z: "z", pygame.K_x: "x",
+                             pygame.K_c: "c", pygame.K_v: "v"}
+
+        # highlight is drawn once and only blitted during playback
+        self._highlight = AssetCache.highlight(color_light, 6)
+
+        # precomputed for every step of the playback: active circles and rendered word
+        self._step_circles = []
+        self._step_texts = []
+        self._started_at = None
+
+    def toggle(self):
+        """Starts typing a new word, or leaves the simulation mode."""
+        self.typing = not self.typing
+        self._word = ""
+        self._clear_trace()
+        if self.typing:
+            self._step_texts = [self._render_word("", "type a word, enter to run")]
+
+    def handle_key(self, key, automaton, circle_group):
+        """Handles keys while typing a word. Returns whether the key was used by the simulation."""
+        if key in self._symbol_keys:
+            self._word += self._symbol_keys[key]
+        elif key == pygame.K_BACKSPACE:
+            self._word = self._word[:-1]
+        elif key == pygame.K_RETURN:
+            self._compute_trace(automaton, circle_group)
+            return True
+        else:
+            return False
+
+        self._clear_trace()
+        self._step_texts = [self._render_word(self._word, "enter to run")]
+        return True
+
+    def _clear_trace(self):
+        """Forgets the computed run, so it isnt drawn anymore."""
+        self._step_circles = []
+        self._step_texts = []
+        self._started_at = None
+
+    def _compute_trace(self, automaton, circle_group):
+        """Runs the word once through the compact automaton, and caches what should be drawn in every step."""
+        compact_automaton = automaton.compact()
+        trace = compact_automaton.run(self._word)
+        circles = {circle.number: circle for circle in circle_group}
+
+        self._step_circles = []
+        self._step_texts = []
+        for step, mask in enumerate(trace):
+            self._step_circles.append([circles[state] for state in compact_automaton.states_of(mask)
+                                       if state in circles])
+            self._step_texts.append(self._render_word(self._word[:step], self._word[step:]))
+
+        verdict = "accepted" if trace[-1] & compact_automaton.accepting_mask else "rejected"
+        self._step_texts[-1] = self._render_word(self._word, verdict)
+        self._started_at = pygame.time.get_ticks()
+
+    def _render_word(self, read_part, rest):
+        """Renders the already read part of the word and the rest of it."""
+        return render_text(f"{read_part} | {rest}", font, color_dark)
+
+    def blit_sequence(self, screen_size):
+        """Returns (image, rect) of cached highlights and word of the current step of the playback."""
+        if not self._step_texts:
+            return []
+
+        step = 0
+        sequence = []
+        if self._started_at is not None:
+            step = (pygame.time.get_ticks() - self._started_at) // self._step_duration
+            # playback stays on the last step, so the result remains visible
+            step = min(step, len(self._step_texts) - 1)
+            sequence = [(self._highlight, self._highlight.get_rect(center=circle.rect.center))
+                        for circle in self._step_circles[step]]
+
+        width, height = screen_size
+        y_offset = 60
+        text = self._step_texts[step]
+        sequence.append((text, text.get_rect(midbottom=(width / 2, height - y_offset))))
+        return sequence
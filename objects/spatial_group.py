@@ -0,0 +1,71 @@
+import itertools
+
+import pygame
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Sprite group which keeps its sprites in a uniform grid, so collisions are tested only with nearby sprites.
+
+    Sprites have to call SpatialGroup.sprite_moved after their rect changes while they are in the group."""
+
+    _cell_size = 128
+
+    def __init__(self, *sprites):
+        """Creates group with an empty grid."""
+        # (column, row) -> sprites whose rect reaches into the cell
+        self._cells = {}
+        # sprite -> cells it is in
+        self._sprite_cells = {}
+        # sprite -> when it was added, so collisions come in the same order as from pygame.sprite.spritecollide
+        self._order = {}
+        self._counter = itertools.count()
+        super().__init__(*sprites)
+
+    def _covered_cells(self, rect):
+        size = self._cell_size
+        return [(column, row)
+                for column in range(rect.left // size, (rect.right - 1) // size + 1)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def _index(self, sprite):
+        cells = self._covered_cells(sprite.rect)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(sprite)
+        self._sprite_cells[sprite] = cells
+
+    def _unindex(self, sprite):
+        for cell in self._sprite_cells.pop(sprite):
+            cell_sprites = self._cells[cell]
+            cell_sprites.discard(sprite)
+            if not cell_sprites:
+                del self._cells[cell]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._order[sprite] = next(self._counter)
+        self._index(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        del self._order[sprite]
+        self._unindex(sprite)
+
+    def reindex(self, sprite):
+        """Moves the sprite to the cells of its current rect."""
+        self._unindex(sprite)
+        self._index(sprite)
+
+    @staticmethod
+    def sprite_moved(sprite):
+        """Updates every spatial group of the sprite after its rect changed."""
+        for group in sprite.groups():
+            if isinstance(group, SpatialGroup):
+                group.reindex(sprite)
+
+    def collide(self, sprite, collided=pygame.sprite.collide_mask):
+        """Returns the same list as pygame.sprite.spritecollide(sprite, self, False, collided)."""
+        candidates = set()
+        for cell in self._covered_cells(sprite.rect):
+            candidates.update(self._cells.get(cell, ()))
+        return [candidate for candidate in sorted(candidates, key=self._order.__getitem__)
+                if collided(sprite, candidate)]
@@ -4,6 +4,8 @@ from automaton import Automaton
 class ProductAutomaton(Automaton):
     """Product automaton simulating player_automaton and level_automaton."""
 
+    __slots__ = ("_player_a", "_level_a")
+
     def __init__(self, player_automaton, level_automaton):
         """Creates product automaton and initialises initial states."""
         super().__init__(0)  # the input automata for product automaton are always deterministic, so product automaton is deterministic as well
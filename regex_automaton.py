@@ -0,0 +1,108 @@
+from automaton import Automaton
+
+
+class RegexParser():
+    """Parses regular expression over single letter symbols, with | * + ? ( ) and ε for the empty word."""
+
+    def __init__(self, pattern):
+        """Creates parser of the pattern, whitespace is ignored."""
+        self._pattern = pattern
+        self._symbols = [character for character in pattern if not character.isspace()]
+        self._index = 0
+        # symbol of each position, positions are numbered from 1 in order of appearance
+        self.positions = [None]
+
+    def _peek(self):
+        return self._symbols[self._index] if self._index < len(self._symbols) else None
+
+    def _error(self):
+        return ValueError(f"invalid regular expression {self._pattern!r} at symbol {self._index}")
+
+    def parse(self):
+        """Returns syntax tree of the whole pattern."""
+        tree = self._union()
+        if self._peek() is not None:
+            raise self._error()
+        return tree
+
+    def _union(self):
+        tree = self._concatenation()
+        while self._peek() == "|":
+            self._index += 1
+            tree = ("union", tree, self._concatenation())
+        return tree
+
+    def _concatenation(self):
+        tree = ("empty",)
+        while self._peek() not in (None, "|", ")"):
+            tree = ("concat", tree, self._repetition())
+        return tree
+
+    def _repetition(self):
+        tree = self._atom()
+        while self._peek() in ("*", "+", "?"):
+            tree = ({"*": "star", "+": "plus", "?": "optional"}[self._peek()], tree)
+            self._index += 1
+        return tree
+
+    def _atom(self):
+        symbol = self._peek()
+        if symbol == "(":
+            self._index += 1
+            tree = self._union()
+            if self._peek() != ")":
+                raise self._error()
+            self._index += 1
+            return tree
+        if symbol is None or symbol in "|)*+?":
+            raise self._error()
+        self._index += 1
+        if symbol == "ε":
+            return ("empty",)
+        self.positions.append(symbol)
+        return ("symbol", len(self.positions) - 1)
+
+
+def _glushkov(tree, follow):
+    """Returns (nullable, first positions, last positions) of the tree, filling follow positions on the way."""
+    kind = tree[0]
+    if kind == "symbol":
+        return False, {tree[1]}, {tree[1]}
+    if kind == "empty":
+        return True, set(), set()
+    if kind == "union":
+        nullable_1, first_1, last_1 = _glushkov(tree[1], follow)
+        nullable_2, first_2, last_2 = _glushkov(tree[2], follow)
+        return nullable_1 or nullable_2, first_1 | first_2, last_1 | last_2
+    if kind == "concat":
+        nullable_1, first_1, last_1 = _glushkov(tree[1], follow)
+        nullable_2, first_2, last_2 = _glushkov(tree[2], follow)
+        for position in last_1:
+            follow[position] |= first_2
+        return (nullable_1 and nullable_2, first_1 | first_2 if nullable_1 else first_1,
+                last_1 | last_2 if nullable_2 else last_2)
+
+    nullable, first, last = _glushkov(tree[1], follow)
+    if kind in ("star", "plus"):
+        for position in last:
+            follow[position] |= first
+    return nullable or kind != "plus", first, last
+
+
+def automaton_from_regex(pattern):
+    """Builds nfa without empty transitions of the regular expression (glushkov's construction).
+
+    State 0 is initial, every other state is a symbol position of the pattern."""
+    parser = RegexParser(pattern)
+    tree = parser.parse()
+    follow = {position: set() for position in range(1, len(parser.positions))}
+    nullable, first, last = _glushkov(tree, follow)
+
+    automaton = Automaton(1)
+    automaton.initial_states = [0]
+    automaton.accepting_states = sorted(last | {0} if nullable else last)
+    # every position is entered by its own symbol only
+    successors = {0: first, **follow}
+    automaton.transition_dict = {state: [[[parser.positions[position]], position] for position in sorted(positions)]
+                                 for state, positions in successors.items() if positions}
+    return automaton
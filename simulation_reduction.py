@@ -0,0 +1,170 @@
+import time
+
+
+class CheckerStats():
+    """Statistics of the nfa reductions done before determinisation."""
+
+    def __init__(self):
+        """Creates zeroed statistics."""
+        self.reductions = 0
+        self.states_before = 0
+        self.states_after = 0
+        self.transitions_before = 0
+        self.transitions_after = 0
+        self.reduction_seconds = 0.0
+        self.determinisation_seconds = 0.0
+        # sizes and time of the latest reduction, added to the checker telemetry event
+        self.last_reduction = {}
+
+    @property
+    def state_reduction_ratio(self):
+        return 1 - self.states_after / self.states_before if self.states_before else 0.0
+
+    @property
+    def transition_reduction_ratio(self):
+        return 1 - self.transitions_after / self.transitions_before if self.transitions_before else 0.0
+
+    def as_dict(self):
+        """Returns the statistics as a dictionary."""
+        return {"reductions": self.reductions,
+                "states_before": self.states_before, "states_after": self.states_after,
+                "transitions_before": self.transitions_before, "transitions_after": self.transitions_after,
+                "state_reduction_ratio": self.state_reduction_ratio,
+                "transition_reduction_ratio": self.transition_reduction_ratio,
+                "reduction_seconds": self.reduction_seconds,
+                "determinisation_seconds": self.determinisation_seconds}
+
+
+class SimulationReduction():
+    """Reduces nfa by forward and backward simulation preorders, the language stays the same."""
+
+    def __init__(self, automaton):
+        """Prepares reduction of the given automaton."""
+        self._automaton = automaton
+        self._alphabet = automaton._alphabet
+        self._states = automaton._collect_states()
+
+    def _edges(self, transition_dict):
+        """Returns successors and predecessors as state -> symbol -> set of states."""
+        successors = {state: {symbol: set() for symbol in self._alphabet} for state in self._states}
+        predecessors = {state: {symbol: set() for symbol in self._alphabet} for state in self._states}
+        for state_from, transitions in transition_dict.items():
+            for symbols, state_to in transitions:
+                for symbol in symbols:
+                    successors[state_from][symbol].add(state_to)
+                    predecessors[state_to][symbol].add(state_from)
+        return successors, predecessors
+
+    def _simulation(self, neighbours, marked):
+        """Greatest simulation: result[p] are the states q simulating p. Marked p (accepting or initial) needs marked q."""
+        simulated_by = {p: {q for q in self._states if (p not in marked) or (q in marked)}
+                        for p in self._states}
+        changed = True
+        while changed:
+            changed = False
+            for p in self._states:
+                for q in list(simulated_by[p]):
+                    # every move of p must be matched by a move of q to a state simulating where p went
+                    for symbol in self._alphabet:
+                        if any(not (simulated_by[p_next] & neighbours[q][symbol])
+                               for p_next in neighbours[p][symbol]):
+                            simulated_by[p].discard(q)
+                            changed = True
+                            break
+        return simulated_by
+
+    def _quotient(self, simulated_by):
+        """Merges states simulating each other. Returns state -> representative."""
+        representatives = {}
+        for p in self._states:
+            if p in representatives:
+                continue
+            for q in simulated_by[p]:
+                if p in simulated_by[q] and q not in representatives:
+                    representatives[q] = p
+        return representatives
+
+    def _apply(self, representatives, transition_dict, initial_states, accepting_states):
+        """Builds transitions and states of the quotient."""
+        new_transitions = {}
+        for state_from, transitions in transition_dict.items():
+            for symbols, state_to in transitions:
+                symbols_to = new_transitions.setdefault(representatives[state_from], {}).setdefault(
+                    representatives[state_to], [])
+                symbols_to.extend(symbol for symbol in symbols if symbol not in symbols_to)
+        new_transition_dict = {state_from: [[symbols, state_to] for state_to, symbols in targets.items()]
+                               for state_from, targets in new_transitions.items()}
+        new_initial = list(dict.fromkeys(representatives[state] for state in initial_states))
+        new_accepting = list(dict.fromkeys(representatives[state] for state in accepting_states))
+        return new_transition_dict, new_initial, new_accepting
+
+    def _prune(self, transition_dict, simulated_by, successors):
+        """Removes transitions p -a-> q, when p -a-> r exists and r simulates q (q is a little brother of r)."""
+        new_transition_dict = {}
+        for state_from, transitions in transition_dict.items():
+            kept = []
+            for symbols, state_to in transitions:
+                kept_symbols = [symbol for symbol in symbols
+                                if not any(other != state_to and other in simulated_by[state_to]
+                                           for other in successors[state_from][symbol])]
+                if kept_symbols:
+                    kept.append([kept_symbols, state_to])
+            if kept:
+                new_transition_dict[state_from] = kept
+        return new_transition_dict
+
+    def reduce(self):
+        """Returns the reduced nondeterministic automaton."""
+        # initialising here, to avoid circular import
+        from automaton import Automaton
+
+        transition_dict = self._automaton.transition_dict
+        initial_states = self._automaton.initial_states
+        accepting_states = self._automaton.accepting_states
+
+        # merging forward simulation equivalent states, then pruning little brothers in the quotient
+        successors, _ = self._edges(transition_dict)
+        forward = self._simulation(successors, set(accepting_states))
+        representatives = self._quotient(forward)
+        transition_dict, initial_states, accepting_states = self._apply(
+            representatives, transition_dict, initial_states, accepting_states)
+        self._states = sorted(set(representatives.values()))
+        successors, _ = self._edges(transition_dict)
+        forward = self._simulation(successors, set(accepting_states))
+        transition_dict = self._prune(transition_dict, forward, successors)
+
+        # merging backward simulation equivalent states
+        _, predecessors = self._edges(transition_dict)
+        backward = self._simulation(predecessors, set(initial_states))
+        transition_dict, initial_states, accepting_states = self._apply(
+            self._quotient(backward), transition_dict, initial_states, accepting_states)
+
+        reduced = Automaton(1)
+        reduced.initial_states = initial_states
+        reduced.accepting_states = accepting_states
+        reduced.transition_dict = transition_dict
+        # pruned transitions can leave states without any use
+        return reduced.trimmed()
+
+
+def reduce_nfa(automaton, stats=None):
+    """Reduces the nfa by simulation and records the sizes and time into stats."""
+    start = time.perf_counter()
+    reduced = SimulationReduction(automaton).reduce()
+    if stats is not None:
+        last_reduction = {
+            "states_before": len(automaton._collect_states()),
+            "states_after": len(reduced._collect_states()),
+            "transitions_before": sum(len(symbols) for transitions in automaton.transition_dict.values()
+                                      for symbols, _ in transitions),
+            "transitions_after": sum(len(symbols) for transitions in reduced.transition_dict.values()
+                                     for symbols, _ in transitions),
+            "reduction_seconds": time.perf_counter() - start}
+        stats.reductions += 1
+        stats.states_before += last_reduction["states_before"]
+        stats.states_after += last_reduction["states_after"]
+        stats.transitions_before += last_reduction["transitions_before"]
+        stats.transitions_after += last_reduction["transitions_after"]
+        stats.reduction_seconds += last_reduction["reduction_seconds"]
+        stats.last_reduction = last_reduction
+    return reduced
@@ -0,0 +1,156 @@
+from collections import deque
+
+
+class StateAnalysis():
+    """Reachable, co-reachable and dead states of an automaton. Updated incrementally when the automaton grows."""
+
+    def __init__(self, automaton):
+        """Creates analysis of the automaton, computed when it is first needed."""
+        self._automaton = automaton
+        self._valid = False
+        self._successors = {}
+        self._predecessors = {}
+        self._reachable = set()
+        self._co_reachable = set()
+
+    @property
+    def reachable_states(self):
+        self._refresh()
+        return self._reachable
+
+    @property
+    def co_reachable_states(self):
+        self._refresh()
+        return self._co_reachable
+
+    @property
+    def useful_states(self):
+        """States on some path from an initial to an accepting state."""
+        self._refresh()
+        return self._reachable & self._co_reachable
+
+    def is_dead(self, state):
+        """Dead state can never reach an accepting state."""
+        self._refresh()
+        return state not in self._co_reachable
+
+    def invalidate(self):
+        """Something was removed, the next query recomputes the whole analysis."""
+        self._valid = False
+
+    def edge_added(self, state_from, state_to):
+        """Updates the analysis after a transition from state_from to state_to got its first symbol."""
+        if not self._valid:
+            return
+        self._successors.setdefault(state_from, set()).add(state_to)
+        self._predecessors.setdefault(state_to, set()).add(state_from)
+        if state_from in self._reachable:
+            self._spread(state_to, self._reachable, self._successors)
+        if state_to in self._co_reachable:
+            self._spread(state_from, self._co_reachable, self._predecessors)
+
+    def initial_state_added(self, state):
+        """Updates the analysis after state became initial."""
+        if self._valid:
+            self._spread(state, self._reachable, self._successors)
+
+    def accepting_state_added(self, state):
+        """Updates the analysis after state became accepting."""
+        if self._valid:
+            self._spread(state, self._co_reachable, self._predecessors)
+
+    def _spread(self, start, marked, neighbours):
+        """Marks start and everything reachable from it through neighbours, stopping at already marked states."""
+        if start in marked:
+            return
+        marked.add(start)
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            for neighbour in neighbours.get(state, ()):
+                if neighbour not in marked:
+                    marked.add(neighbour)
+                    queue.append(neighbour)
+
+    def _refresh(self):
+        """Recomputes the analysis from scratch, if it isnt valid anymore."""
+        if self._valid:
+            return
+
+        # only transitions with a symbol can be taken
+        self._successors = {}
+        self._predecessors = {}
+        for state_from, transitions in self._automaton.transition_dict.items():
+            for symbols, state_to in transitions:
+                if symbols:
+                    self._successors.setdefault(state_from, set()).add(state_to)
+                    self._predecessors.setdefault(state_to, set()).add(state_from)
+
+        # roots from initial states go first, so states visited by them are exactly the reachable ones
+        initial_states = list(self._automaton.initial_states)
+        other_states = [state for state in self._automaton._collect_states()
+                        if state not in initial_states]
+        self._reachable = set()
+        self._co_reachable = set()
+        accepting_states = set(self._automaton.accepting_states)
+
+        visited = set()
+        for component, from_initial in self._strongly_connected_components(initial_states, other_states, visited):
+            if from_initial:
+                self._reachable.update(component)
+            # components come in reverse topological order, successors of a component are already decided
+            if (accepting_states.intersection(component)
+                    or any(successor in self._co_reachable
+                           for state in component for successor in self._successors.get(state, ()))):
+                self._co_reachable.update(component)
+
+        self._valid = True
+
+    def _strongly_connected_components(self, initial_states, other_states, visited):
+        """Iterative tarjan's algorithm. Yields (component, reached from initial state) in reverse topological order."""
+        index = {}
+        low_link = {}
+        stack = []
+        on_stack = set()
+
+        for roots, from_initial in ((initial_states, True), (other_states, False)):
+            for root in roots:
+                if root in visited:
+                    continue
+                # each frame of the work stack is a state and iterator over its successors
+                work = [(root, iter(self._successors.get(root, ())))]
+                visited.add(root)
+                index[root] = low_link[root] = len(index)
+                stack.append(root)
+                on_stack.add(root)
+
+                while work:
+                    state, successors = work[-1]
+                    advanced = False
+                    for successor in successors:
+                        if successor not in visited:
+                            visited.add(successor)
+                            index[successor] = low_link[successor] = len(index)
+                            stack.append(successor)
+                            on_stack.add(successor)
+                            work.append((successor, iter(self._successors.get(successor, ()))))
+                            advanced = True
+                            break
+                        if successor in on_stack:
+                            low_link[state] = min(low_link[state], index[successor])
+                    if advanced:
+                        continue
+
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[state])
+                    if low_link[state] == index[state]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == state:
+                                break
+                        yield component, from_initial
@@ -0,0 +1,91 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+
+class Telemetry():
+    """Structured events of the game, written as newline delimited json into rotating files.
+
+    Emitting only appends to a deque, a background thread turns the events into json and writes them,
+    so the frame loop never waits for the disk nor for a lock."""
+
+    _file_name = "events.ndjson"
+
+    def __init__(self, directory=None, max_bytes=1024 * 1024, backups=5, interval=0.25):
+        """Creates telemetry writing into the directory, or disabled one if there's no directory."""
+        self.enabled = bool(directory)
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._interval = interval
+        # events of one run of the game share the session, so they can be told apart in the files
+        self._session = uuid.uuid4().hex[:12]
+        # fields added to every event, e.g. the current level
+        self._context = {}
+        # append and popleft of a deque are atomic, when the writer falls behind the oldest events are dropped
+        self._events = deque(maxlen=100000)
+        self._writer = None
+        self._stopping = threading.Event()
+
+    def set_context(self, **fields):
+        """Replaces the fields added to every following event."""
+        self._context = fields
+
+    def emit(self, kind, **fields):
+        """Queues the event, its written later by the background thread."""
+        if not self.enabled:
+            return
+        self._events.append((time.time(), kind, self._context, fields))
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_events, daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def close(self):
+        """Writes the events still queued and stops the writer. Blocks until done."""
+        if self._writer is not None:
+            self._stopping.set()
+            self._writer.join()
+            self._writer = None
+            self._stopping.clear()
+
+    def _path(self, index=0):
+        name = self._file_name if index == 0 else f"events.{index}.ndjson"
+        return os.path.join(self._directory, name)
+
+    def _write_events(self):
+        """Background thread writing queued events every interval, until its stopped."""
+        os.makedirs(self._directory, exist_ok=True)
+        file = open(self._path(), "a", encoding="utf-8")
+        while True:
+            stopping = self._stopping.wait(self._interval)
+            lines = []
+            while self._events:
+                timestamp, kind, context, fields = self._events.popleft()
+                lines.append(json.dumps({"time": timestamp, "session": self._session, "event": kind,
+                                         **context, **fields}, separators=(",", ":")) + "\n")
+            if lines:
+                file.write("".join(lines))
+                file.flush()
+                # full file is moved aside, events continue in a new one
+                if file.tell() >= self._max_bytes:
+                    file.close()
+                    self._rotate()
+                    file = open(self._path(), "a", encoding="utf-8")
+            if stopping:
+                file.close()
+                return
+
+    def _rotate(self):
+        """Shifts the older files by one, the oldest one is deleted."""
+        for index in range(self._backups, 0, -1):
+            if os.path.exists(self._path(index - 1)):
+                os.replace(self._path(index - 1), self._path(index))
+
+
+# shared by the game, the button and the checker. enabled by setting AUTOMATONTRON_TELEMETRY to a directory
+telemetry = Telemetry(os.environ.get("AUTOMATONTRON_TELEMETRY"))
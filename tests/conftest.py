@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the game imports its modules from the root directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,15 @@
+import random
+
+from tests.test_simulation_reduction import random_nfa
+
+
+def test_determinisation_keeps_the_language():
+    rng = random.Random(26)
+    for _ in range(200):
+        automaton = random_nfa(rng, rng.randrange(1, 9))
+        dfa = automaton.determinise_nfa()
+        assert dfa.canonical_form() == automaton.canonical_form()
+        # every subset state has at most one successor under each symbol
+        for transitions in dfa.transition_dict.values():
+            symbols = [symbol for symbols, _ in transitions for symbol in symbols]
+            assert len(symbols) == len(set(symbols))
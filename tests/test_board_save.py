@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from levels.board_save import BoardSave
+
+
+def circle(number, x, y, variant):
+    return SimpleNamespace(number=number, x=x, y=y, variant=variant)
+
+
+def test_encode_decode_round_trip():
+    board_save = BoardSave()
+    circles = [circle(1, 10.4, 20.6, "initial"), circle(2, -5, 300, "accepting"), circle(4, 0, 0, "base")]
+    transition_dict = {1: [[["z", "x"], 2], [["v"], 1]], 2: [[["c"], 4]], 4: []}
+    data = board_save.encode(5, circles, transition_dict)
+
+    assert board_save.decode(data) == (
+        5, [(1, 10, 21, "initial"), (2, -5, 300, "accepting"), (4, 0, 0, "base")],
+        [(1, 2, ["z", "x"]), (1, 1, ["v"]), (2, 4, ["c"])])
+
+
+def test_unusable_saves_are_rejected():
+    board_save = BoardSave()
+    data = board_save.encode(3, [circle(1, 0, 0, "initial"), circle(2, 0, 0, "base")], {1: [[["z"], 2]]})
+
+    assert board_save.decode(data[:-1]) is None
+    assert board_save.decode(b"ATB\x09" + data[4:]) is None
+    # transitions must join saved circles
+    assert board_save.decode(board_save.encode(3, [circle(1, 0, 0, "base")], {1: [[["z"], 2]]})) is None
+    assert board_save.decode(board_save.encode(3, [circle(1, 0, 0, "base"), circle(1, 5, 5, "base")], {})) is None
+
+
+def test_boards_are_kept_per_profile(tmp_path):
+    board_save = BoardSave(str(tmp_path))
+    board_save.save_board("player 1", 0, 2, 3, [circle(1, 0, 0, "initial")], {1: []})
+    board_save.save_board("player/2", 0, 2, 7, [circle(6, 1, 1, "accepting")], {6: []})
+    board_save.close()
+
+    assert board_save.load_board("player 1", 0, 2) == (3, [(1, 0, 0, "initial")], [])
+    assert board_save.load_board("player/2", 0, 2) == (7, [(6, 1, 1, "accepting")], [])
+    assert board_save.load_board("player 3", 0, 2) is None
@@ -0,0 +1,79 @@
+import copy
+import random
+
+from conformance_suite import ConformanceSuite
+from tests.test_simulation_reduction import accepts, random_nfa
+
+
+def state_count(automaton):
+    states = set(automaton.transition_dict) | set(automaton.initial_states) | set(automaton.accepting_states)
+    states.update(state_to for transitions in automaton.transition_dict.values() for _, state_to in transitions)
+    return max(states) + 1
+
+
+def mutate(rng, automaton):
+    """Copy of the automaton with one transition redirected or one state switching between accepting and not."""
+    mutant = copy.deepcopy(automaton)
+    states = list(range(state_count(mutant)))
+    transitions = [transition for transitions in mutant.transition_dict.values() for transition in transitions]
+    if transitions and rng.random() < 0.5:
+        rng.choice(transitions)[1] = rng.choice(states)
+    else:
+        state = rng.choice(states)
+        accepting_states = set(mutant.accepting_states) ^ {state}
+        mutant.accepting_states = sorted(accepting_states)
+    return mutant
+
+
+def test_similar_wrong_automata_are_rejected():
+    rng = random.Random(36)
+    rejected = 0
+    for _ in range(300):
+        level_automaton = random_nfa(rng, rng.randrange(1, 5))
+        suite = ConformanceSuite(level_automaton, extra_states=1)
+        player_automaton = mutate(rng, level_automaton)
+        counter_example = suite.find_counter_example(player_automaton)
+
+        player_form = player_automaton.canonical_form()
+        if player_form == level_automaton.canonical_form():
+            assert counter_example is None
+        elif len(player_form[1]) <= len(level_automaton.canonical_form()[1]) + suite.extra_states:
+            # the suite is complete for automata this small, so the mutant never slips through
+            assert counter_example is not None, (level_automaton.transition_dict, player_automaton.transition_dict)
+        if counter_example is not None:
+            word, should_accept = counter_example
+            assert accepts(level_automaton, word) == should_accept
+            assert accepts(player_automaton, word) != should_accept
+            rejected += 1
+    assert rejected
+
+
+def test_equivalent_automata_pass():
+    rng = random.Random(7)
+    for _ in range(100):
+        level_automaton = random_nfa(rng, rng.randrange(1, 5))
+        suite = ConformanceSuite(level_automaton, extra_states=1)
+        assert suite.find_counter_example(level_automaton) is None
+
+        # unrolling every state into two copies keeps the language but doubles the states
+        copy_offset = state_count(level_automaton)
+        player_automaton = copy.deepcopy(level_automaton)
+        player_automaton.transition_dict = {}
+        for state, transitions in level_automaton.transition_dict.items():
+            for copy_index in range(2):
+                player_automaton.transition_dict[state + copy_index * copy_offset] = [
+                    [symbols, state_to + (1 - copy_index) * copy_offset] for symbols, state_to in transitions]
+        player_automaton.accepting_states = [state + copy_index * copy_offset
+                                             for state in level_automaton.accepting_states for copy_index in range(2)]
+        assert suite.find_counter_example(player_automaton) is None
+
+
+def test_suite_restored_from_trie_gives_the_same_verdicts():
+    rng = random.Random(3)
+    for _ in range(50):
+        level_automaton = random_nfa(rng, rng.randrange(1, 5))
+        suite = ConformanceSuite(level_automaton)
+        restored = ConformanceSuite.from_trie(level_automaton._alphabet, suite.extra_states, suite.trie)
+        player_automaton = mutate(rng, level_automaton)
+        assert restored.size == suite.size
+        assert restored.find_counter_example(player_automaton) == suite.find_counter_example(player_automaton)
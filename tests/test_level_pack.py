@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+from conformance_suite import ConformanceSuite
+from levels.level import Level
+from levels.level_pack import LevelPack
+
+levels_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels", "levels.json")
+
+
+def json_levels():
+    with open(levels_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    return {int(key.split("_")[1]): levels for key, levels in data.items()}
+
+
+def test_pack_matches_levels_file(tmp_path):
+    LevelPack(levels_path, str(tmp_path / "levels.pack")).sections
+    # read back by a new pack, which finds the one written on disk
+    pack = LevelPack(levels_path, str(tmp_path / "levels.pack"))
+    sections = json_levels()
+
+    assert pack.sections == sorted(sections)
+    for section, levels in sections.items():
+        assert pack.level_count(section) == len(levels)
+        for level_number, level_json in enumerate(levels, 1):
+            level_data = pack.level_data(section, level_number)
+            assert level_data["language"] == level_json["language"]
+            assert level_data["text_lines"] == level_json["text_lines"]
+            if "transition_dict" in level_json:
+                automaton = pack._validated_automaton(level_json, "")
+                assert level_data["automaton"] == automaton.canonical_form()
+
+
+def test_levels_restore_the_conformance_suite(tmp_path):
+    pack = LevelPack(levels_path, str(tmp_path / "levels.pack"))
+    for section in pack.sections:
+        for level_number in range(1, pack.level_count(section) + 1):
+            level = Level(section, level_number)
+            level.initialize_data(pack)
+            if level.automaton is None:
+                continue
+            suite = ConformanceSuite(level.automaton, level.test_suite.extra_states)
+            assert level.test_suite.trie == suite.trie
+            assert level.test_suite.find_counter_example(level.automaton) is None
+
+
+def test_unknown_top_level_key_is_reported(tmp_path):
+    source = tmp_path / "levels.json"
+    source.write_text('{"section_0": [{"language": "", "text_lines": []}], "sections_1": []}', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="sections_1"):
+        LevelPack(str(source), str(tmp_path / "levels.pack")).sections
+
+
+def test_broken_levels_file_keeps_the_old_levels(tmp_path):
+    source = tmp_path / "levels.json"
+    source.write_text('{"section_0": [{"language": "a", "text_lines": ["first"]}]}', encoding="utf-8")
+    pack = LevelPack(str(source), str(tmp_path / "levels.pack"))
+    assert pack.level_data(0, 1)["text_lines"] == ["first"]
+
+    source.write_text('{"section_0": [{"language": "a"}]}', encoding="utf-8")
+    assert pack.reload() == set()
+    assert pack.reload_error
+    assert pack.level_data(0, 1)["text_lines"] == ["first"]
+
+    source.write_text('{"section_0": [{"language": "a", "text_lines": ["second"]}]}', encoding="utf-8")
+    assert pack.reload() == {(0, 1)}
+    assert pack.reload_error is None
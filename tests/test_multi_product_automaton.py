@@ -0,0 +1,111 @@
+import itertools
+import random
+from collections import deque
+
+from automaton import Automaton
+from multi_product_automaton import LevelGoal, bounds_predicate, evaluate_expression
+from tests.test_simulation_reduction import accepts, random_nfa
+
+alphabet = Automaton(1)._alphabet
+
+
+def random_expression(rng, level_count, depth=2):
+    if depth == 0 or rng.random() < 0.4:
+        return rng.randrange(level_count)
+    operator = rng.choice(("and", "or", "not"))
+    if operator == "not":
+        return ["not", random_expression(rng, level_count, depth - 1)]
+    return [operator] + [random_expression(rng, level_count, depth - 1) for _ in range(rng.randrange(1, 4))]
+
+
+def step(automaton, states, symbol):
+    return frozenset(state_to for state in states for symbols, state_to in automaton.transition_dict.get(state, [])
+                     if symbol in symbols)
+
+
+def eager_counter_example(player_automaton, level_automata, predicate):
+    """Builds the whole product of subsets first, then searches it for the shortest word breaking the goal."""
+    automata = [player_automaton] + level_automata
+    initial_state = tuple(frozenset(automaton.initial_states) for automaton in automata)
+    edges = {}
+    pending = [initial_state]
+    while pending:
+        state = pending.pop()
+        if state in edges:
+            continue
+        edges[state] = [tuple(step(automaton, states, symbol) for automaton, states in zip(automata, state))
+                        for symbol in alphabet]
+        pending.extend(edges[state])
+
+    def verdict(state):
+        accepting = [bool(states & set(automaton.accepting_states)) for automaton, states in zip(automata, state)]
+        return predicate(accepting[0], tuple(accepting[1:]))
+
+    queue = deque([(initial_state, "")])
+    seen = {initial_state}
+    while queue:
+        state, word = queue.popleft()
+        should_accept = verdict(state)
+        if should_accept is not None:
+            return (word, should_accept)
+        for symbol, new_state in zip(alphabet, edges[state]):
+            if new_state not in seen:
+                seen.add(new_state)
+                queue.append((new_state, word + symbol))
+    return True
+
+
+def brute_force_counter_example(player_automaton, level_automata, predicate, max_length):
+    """First word in order of length and alphabet breaking the goal, or True if no word up to max_length does."""
+    for length in range(max_length + 1):
+        for letters in itertools.product(alphabet, repeat=length):
+            word = "".join(letters)
+            should_accept = predicate(accepts(player_automaton, word),
+                                      tuple(accepts(automaton, word) for automaton in level_automata))
+            if should_accept is not None:
+                return (word, should_accept)
+    return True
+
+
+def test_goal_verdicts_match_eager_product_and_word_enumeration():
+    rng = random.Random(29)
+    verdicts = set()
+    for _ in range(300):
+        level_automata = [random_nfa(rng, rng.randrange(1, 4)) for _ in range(rng.randrange(1, 4))]
+        player_automaton = random_nfa(rng, rng.randrange(1, 5))
+        lower = random_expression(rng, len(level_automata)) if rng.random() < 0.8 else None
+        upper = random_expression(rng, len(level_automata)) if rng.random() < 0.8 else None
+        predicate = bounds_predicate(lower, upper)
+
+        verdict = LevelGoal(level_automata, lower, upper).check(player_automaton)
+        assert verdict == eager_counter_example(player_automaton, level_automata, predicate)
+        brute_force_verdict = brute_force_counter_example(player_automaton, level_automata, predicate, 4)
+        if verdict is True or len(verdict[0]) > 4:
+            assert brute_force_verdict is True
+        else:
+            assert verdict == brute_force_verdict
+        verdicts.add(verdict is True)
+    assert verdicts == {True, False}
+
+
+def test_player_matching_the_goal_exactly_passes():
+    rng = random.Random(2)
+    level_automata = [random_nfa(rng, 3), random_nfa(rng, 3)]
+    # player language is the intersection of both levels, lower and upper bound are the same
+    goal = LevelGoal(level_automata, ["and", 0, 1], ["and", 0, 1])
+    player_automaton = Automaton(1)
+    for first_state, first_transitions in level_automata[0].transition_dict.items():
+        for second_state, second_transitions in level_automata[1].transition_dict.items():
+            for first_symbols, first_to in first_transitions:
+                for second_symbols, second_to in second_transitions:
+                    symbols = [symbol for symbol in first_symbols if symbol in second_symbols]
+                    if symbols:
+                        player_automaton.transition_dict.setdefault((first_state, second_state), []).append(
+                            [symbols, (first_to, second_to)])
+    player_automaton.initial_states = list(itertools.product(level_automata[0].initial_states,
+                                                             level_automata[1].initial_states))
+    player_automaton.accepting_states = list(itertools.product(level_automata[0].accepting_states,
+                                                               level_automata[1].accepting_states))
+
+    assert goal.check(player_automaton) is True
+    assert evaluate_expression(["not", ["or", 0, 1]], (False, False)) is True
@@ -0,0 +1,68 @@
+import sqlite3
+import time
+
+from levels.level_catalogue import LevelCatalogue
+from levels.progress_store import ProgressStore
+from levels.save import Save
+from tests.test_level_pack import levels_path
+
+
+def test_unlocks_and_attempts_dont_wait_for_the_store(tmp_path):
+    path = str(tmp_path / "progress.db")
+    save = Save(LevelCatalogue(levels_path), ProgressStore(path), str(tmp_path / "saves.json"))
+    save.load_data()
+    save.level_stats()
+
+    # another connection holds the write lock, so the background writer has to wait for it
+    blocker = sqlite3.connect(path)
+    blocker.execute("BEGIN EXCLUSIVE")
+    start = time.perf_counter()
+    save.record_attempt(0, 1, 12.5, False, "z")
+    save.record_attempt(0, 1, 8.0, True)
+    save.save_unlocked_level(0, 2)
+    stats = save.level_stats()
+    elapsed = time.perf_counter() - start
+    blocker.rollback()
+    blocker.close()
+
+    assert elapsed < 0.5
+    assert stats[(0, 1)] == (2, 1, 8.0)
+    save.close()
+    # the store agrees with the statistics kept in memory
+    store = ProgressStore(path)
+    assert store.level_stats(save.profile) == stats
+    assert (0, 2) in store.unlocked_levels(save.profile)
+
+
+def test_failed_writes_are_tried_again(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(ProgressStore, "_retry_seconds", 0.05)
+    # the lock below outlasts the busy timeout of the writer, so the first write fails
+    monkeypatch.setattr(sqlite3, "connect", lambda *arguments: sqlite3.Connection(*arguments, timeout=0.05))
+    path = str(tmp_path / "progress.db")
+    store = ProgressStore(path)
+    store.add_profile("player 1")
+    store.profiles()
+
+    blocker = sqlite3.Connection(path)
+    blocker.execute("BEGIN EXCLUSIVE")
+    store.unlock("player 1", 0, 2)
+    store.record_attempt("player 1", 0, 1, 3.0, True)
+    time.sleep(0.3)
+    blocker.rollback()
+    blocker.close()
+
+    store.close()
+    assert "writing" in caplog.text
+    assert store.unlocked_levels("player 1") == {(0, 2)}
+    assert store.level_stats("player 1") == {(0, 1): (1, 1, 3.0)}
+
+
+def test_write_which_can_never_succeed_doesnt_block_the_others(tmp_path, caplog):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    store.add_profile("player 1")
+    # profile which doesnt exist breaks the not null profile id
+    store.record_attempt("nobody", 0, 1, 3.0, True)
+    store.unlock("player 1", 0, 2)
+    store.close()
+    assert "write dropped" in caplog.text
+    assert store.unlocked_levels("player 1") == {(0, 2)}
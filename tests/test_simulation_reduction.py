@@ -0,0 +1,53 @@
+import itertools
+import random
+
+from automaton import Automaton
+from simulation_reduction import CheckerStats, reduce_nfa
+
+
+def random_nfa(rng, state_count):
+    automaton = Automaton(1)
+    transition_dict = {}
+    for state_from in range(state_count):
+        for _ in range(rng.randrange(4)):
+            symbols = rng.sample(automaton._alphabet, rng.randrange(1, 3))
+            transition_dict.setdefault(state_from, []).append([symbols, rng.randrange(state_count)])
+    automaton.transition_dict = transition_dict
+    automaton.initial_states = rng.sample(range(state_count), rng.randrange(1, min(state_count, 2) + 1))
+    automaton.accepting_states = rng.sample(range(state_count), rng.randrange(1, state_count + 1))
+    return automaton
+
+
+def accepts(automaton, word):
+    """Runs the nfa on the word by following every transition, independent of the automaton class."""
+    current = set(automaton.initial_states)
+    for symbol in word:
+        current = {state_to for state in current for symbols, state_to in automaton.transition_dict.get(state, [])
+                   if symbol in symbols}
+    return bool(current & set(automaton.accepting_states))
+
+
+def test_reduction_keeps_the_language():
+    rng = random.Random(2024)
+    for _ in range(200):
+        automaton = random_nfa(rng, rng.randrange(1, 9))
+        reduced = reduce_nfa(automaton)
+        assert reduced.canonical_form() == automaton.canonical_form()
+        for length in range(5):
+            for word in itertools.product(automaton._alphabet, repeat=length):
+                assert accepts(reduced, word) == accepts(automaton, word), (automaton.transition_dict, word)
+
+
+def test_reduction_merges_equivalent_states():
+    automaton = Automaton(1)
+    # states 1 and 2 accept the same language, so one of them is enough
+    automaton.transition_dict = {0: [[["z"], 1], [["z"], 2]], 1: [[["x"], 3]], 2: [[["x"], 3]]}
+    automaton.initial_states = [0]
+    automaton.accepting_states = [3]
+    stats = CheckerStats()
+    reduced = reduce_nfa(automaton, stats)
+
+    assert len(reduced._collect_states()) == 3
+    assert stats.last_reduction["states_before"] == 4
+    assert stats.last_reduction["states_after"] == 3
+    assert stats.reductions == 1 and stats.states_before == 4 and stats.states_after == 3
@@ -0,0 +1,57 @@
+import random
+
+import pygame
+
+from objects.spatial_group import SpatialGroup
+
+
+def make_sprite(rng):
+    sprite = pygame.sprite.Sprite()
+    sprite.image = pygame.Surface((rng.randrange(10, 300), rng.randrange(10, 300)), pygame.SRCALPHA)
+    # circle shaped mask, so rects can overlap without the masks touching
+    radius = min(sprite.image.get_size()) // 2
+    pygame.draw.circle(sprite.image, (255, 255, 255), (radius, radius), radius)
+    sprite.mask = pygame.mask.from_surface(sprite.image)
+    sprite.rect = sprite.image.get_rect(topleft=(rng.randrange(-200, 1400), rng.randrange(-200, 900)))
+    return sprite
+
+
+def test_collide_matches_spritecollide_while_sprites_move():
+    rng = random.Random(48)
+    group = SpatialGroup()
+    sprites = [make_sprite(rng) for _ in range(60)]
+    group.add(*sprites)
+    probes = [make_sprite(rng) for _ in range(5)]
+    collisions = 0
+
+    for _ in range(200):
+        moved = rng.choice(sprites)
+        # small steps stay in the same cells, big jumps cross them
+        step = rng.choice((3, 40, 400))
+        moved.rect.move_ip(rng.randint(-step, step), rng.randint(-step, step))
+        SpatialGroup.sprite_moved(moved)
+        if rng.random() < 0.1:
+            removed = rng.choice(sprites)
+            if group.has(removed):
+                group.remove(removed)
+            else:
+                group.add(removed)
+
+        for probe in probes:
+            probe.rect.topleft = (rng.randrange(-200, 1400), rng.randrange(-200, 900))
+            collided = group.collide(probe)
+            assert collided == pygame.sprite.spritecollide(probe, group, False, pygame.sprite.collide_mask)
+            collisions += len(collided)
+            assert group.collide(probe, pygame.sprite.collide_rect) == pygame.sprite.spritecollide(
+                probe, group, False, pygame.sprite.collide_rect)
+    assert collisions > 100
+
+
+def test_killed_sprites_leave_the_grid():
+    rng = random.Random(4)
+    group = SpatialGroup()
+    sprite = make_sprite(rng)
+    group.add(sprite)
+    sprite.kill()
+    assert group.collide(sprite, pygame.sprite.collide_rect) == []
+    assert not group._cells
@@ -0,0 +1,111 @@
+import random
+from types import SimpleNamespace
+
+import pygame
+
+from automaton import Automaton
+from state_analysis import StateAnalysis
+
+
+class CircleGroup():
+    """Stands in for the circle group, the arrow touches exactly the two circles it joins."""
+
+    def __init__(self, circles):
+        self._circles = circles
+
+    def collide(self, arrow):
+        return self._circles
+
+
+def circle(number):
+    return SimpleNamespace(number=number, rect=pygame.Rect(number * 100, 0, 50, 50))
+
+
+def delete_transition(automaton, state_from, transition):
+    circle_from, circle_to = circle(state_from), circle(transition[1])
+    points = [circle_from.rect.center] if state_from == transition[1] else [circle_from.rect.center,
+                                                                              circle_to.rect.center]
+    arrow = SimpleNamespace(points=points, symbols=list(transition[0]))
+    automaton.handle_delete_transition_entirely(arrow, CircleGroup([circle_from, circle_to]))
+
+
+def closure(starts, edges):
+    marked = set(starts)
+    stack = list(starts)
+    while stack:
+        for neighbour in edges.get(stack.pop(), ()):
+            if neighbour not in marked:
+                marked.add(neighbour)
+                stack.append(neighbour)
+    return marked
+
+
+def brute_force(automaton):
+    """Reachable and co reachable states by plain graph search over transitions with a symbol."""
+    successors, predecessors = {}, {}
+    for state_from, transitions in automaton.transition_dict.items():
+        for symbols, state_to in transitions:
+            if symbols:
+                successors.setdefault(state_from, set()).add(state_to)
+                predecessors.setdefault(state_to, set()).add(state_from)
+    return closure(automaton.initial_states, successors), closure(automaton.accepting_states, predecessors)
+
+
+def random_edit(rng, automaton, state_count):
+    """Does one edit the player can do on the board."""
+    states = range(state_count)
+    transitions = [(state_from, transition) for state_from, state_transitions in automaton.transition_dict.items()
+                   for transition in state_transitions]
+    edit = rng.randrange(7)
+    if edit == 0:
+        automaton.circle_from, automaton.circle_to = circle(rng.choice(states)), circle(rng.choice(states))
+        automaton._add_new_transition_to_dict()
+    elif edit in (1, 2) and transitions:
+        # adds the symbol, or removes it if the transition already has it
+        state_from, transition = rng.choice(transitions)
+        automaton._update_transition_in_dict(state_from, transition[1], rng.choice("zxcv"))
+    elif edit == 3 and transitions:
+        delete_transition(automaton, *rng.choice(transitions))
+    elif edit == 4:
+        state = rng.choice(states)
+        if state in automaton.initial_states and rng.random() < 0.5:
+            automaton.remove_initial_state(state)
+        else:
+            automaton.add_initial_state(state)
+    elif edit == 5:
+        state = rng.choice(states)
+        if state in automaton.accepting_states and rng.random() < 0.5:
+            automaton.remove_accepting_state(state)
+        else:
+            automaton.add_accepting_state(state)
+
+
+def test_incremental_analysis_matches_full_recompute():
+    rng = random.Random(34)
+    for _ in range(50):
+        automaton = Automaton(1)
+        state_count = rng.randrange(2, 10)
+        for _ in range(60):
+            random_edit(rng, automaton, state_count)
+            # querying after every edit keeps the analysis valid, so the next additions are applied incrementally
+            analysis = automaton.analysis
+            recomputed = StateAnalysis(automaton)
+            reachable, co_reachable = brute_force(automaton)
+            assert analysis.reachable_states == recomputed.reachable_states == reachable
+            assert analysis.co_reachable_states == recomputed.co_reachable_states == co_reachable
+            assert analysis.useful_states == reachable & co_reachable
+
+
+def test_additions_are_applied_without_recompute(monkeypatch):
+    automaton = Automaton(1)
+    automaton.circle_from, automaton.circle_to = circle(0), circle(1)
+    automaton._add_new_transition_to_dict()
+    automaton.add_initial_state(0)
+    assert automaton.analysis.reachable_states == {0}
+
+    monkeypatch.setattr(StateAnalysis, "_refresh", lambda self: None)
+    automaton._update_transition_in_dict(0, 1, "z")
+    automaton.add_accepting_state(1)
+    assert automaton.analysis.reachable_states == {0, 1}
+    assert automaton.analysis.co_reachable_states == {0, 1}
+    assert not automaton.analysis.is_dead(0)
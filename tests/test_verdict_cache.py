@@ -0,0 +1,86 @@
+from automaton import Automaton
+from verdict_cache import VerdictCache
+
+
+def make_automaton(transition_dict, initial_states, accepting_states):
+    automaton = Automaton(1)
+    automaton.transition_dict = transition_dict
+    automaton.initial_states = initial_states
+    automaton.accepting_states = accepting_states
+    return automaton
+
+
+class CountingCheck():
+    """Level check which counts how often it really runs."""
+
+    def __init__(self, level_automaton):
+        self.level_automaton = level_automaton
+        self.calls = 0
+
+    def __call__(self, player_automaton):
+        self.calls += 1
+        return player_automaton.handle_checking_language(self.level_automaton)
+
+
+def level():
+    # L = {z}
+    level_automaton = make_automaton({0: [[["z"], 1]]}, [0], [1])
+    level_form = level_automaton.canonical_form()
+    return level_automaton, level_form, level_automaton.canonical_signature(level_form)
+
+
+def test_same_language_is_served_from_cache():
+    level_automaton, level_form, level_signature = level()
+    cache = VerdictCache()
+    check = CountingCheck(level_automaton)
+    player_automaton = make_automaton({0: [[["z"], 1]]}, [0], [1])
+    # the same language with differently numbered and unused states
+    other_automaton = make_automaton({5: [[["z"], 7]], 8: [[["x"], 5]]}, [5], [7])
+
+    assert cache.check(player_automaton, level_form, level_signature, check) is True
+    assert cache.check(other_automaton, level_form, level_signature, check) is True
+    assert check.calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "collisions": 0, "hit_rate": 0.5, "languages": 1}
+
+
+def test_hash_collision_falls_back_to_full_check(monkeypatch):
+    level_automaton, level_form, level_signature = level()
+    cache = VerdictCache()
+    check = CountingCheck(level_automaton)
+    monkeypatch.setattr(Automaton, "canonical_signature", lambda self, canonical_form=None: "same")
+    correct_automaton = make_automaton({0: [[["z"], 1]]}, [0], [1])
+    wrong_automaton = make_automaton({0: [[["x"], 1]]}, [0], [1])
+
+    assert cache.check(correct_automaton, level_form, level_signature, check) is True
+    assert cache.check(wrong_automaton, level_form, level_signature, check) == ("x", False)
+    assert check.calls == 2
+    assert cache.collisions == 1 and cache.hits == 0 and cache.misses == 2
+
+
+def test_errors_are_never_cached():
+    level_automaton, level_form, level_signature = level()
+    cache = VerdictCache()
+    check = CountingCheck(level_automaton)
+    # no initial state
+    broken_automaton = make_automaton({0: [[["z"], 1]]}, [], [1])
+
+    assert cache.check(broken_automaton, level_form, level_signature, check) == 2
+    assert cache.check(broken_automaton, level_form, level_signature, check) == 2
+    assert check.calls == 0
+    assert cache.stats()["languages"] == 0 and cache.hits == cache.misses == 0
+
+
+def test_least_recently_used_verdicts_are_evicted():
+    level_automaton, level_form, level_signature = level()
+    cache = VerdictCache(max_verdicts=2)
+    check = CountingCheck(level_automaton)
+    automata = [make_automaton({0: [[[symbol], 1]]}, [0], [1]) for symbol in "zxc"]
+
+    cache.check_batch(automata[:2], level_form, level_signature, check)
+    cache.check(automata[0], level_form, level_signature, check)
+    cache.check(automata[2], level_form, level_signature, check)
+    # the verdict for "x" was the least recently used one
+    cache.check_batch([automata[0], automata[1]], level_form, level_signature, check)
+    assert check.calls == 4
+    assert cache.stats()["languages"] == 2
+    assert cache.hit_rate == 2 / 6
@@ -0,0 +1,190 @@
+# run from the root of the game: python -m tools.level_validator [levels file] [--workers N]
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from automaton import Automaton
+from levels.level_catalogue import LevelCatalogue
+from regex_automaton import automaton_from_regex
+
+
+def _automaton_problems(automaton_data, alphabet):
+    """Checks that the json data describes an automaton. Returns list of problems and the automaton, or None."""
+    problems = []
+    transition_dict = {}
+    for key, transitions in automaton_data.get("transition_dict", {}).items():
+        if not key.lstrip("-").isdigit():
+            problems.append(f"state {key!r} isnt a number")
+            continue
+        transition_dict[int(key)] = []
+        for transition in transitions:
+            if (not isinstance(transition, list) or len(transition) != 2
+                    or not isinstance(transition[0], list) or not isinstance(transition[1], int)):
+                problems.append(f"transition {transition!r} of state {key} isnt [[symbols], state]")
+                continue
+            unknown_symbols = [symbol for symbol in transition[0] if symbol not in alphabet]
+            if unknown_symbols:
+                problems.append(f"transition of state {key} uses symbols {unknown_symbols} outside of the alphabet")
+                continue
+            transition_dict[int(key)].append(transition)
+
+    for kind in ("initial_states", "accepting_states"):
+        states = automaton_data.get(kind)
+        if not isinstance(states, list) or not all(isinstance(state, int) for state in states):
+            problems.append(f"{kind} isnt a list of numbers")
+    if problems:
+        return problems, None
+
+    automaton = Automaton(1)
+    automaton.initial_states = automaton_data["initial_states"]
+    automaton.accepting_states = automaton_data["accepting_states"]
+    automaton.transition_dict = transition_dict
+
+    if not automaton.initial_states:
+        problems.append("there is no initial state")
+    # states which only appear as initial or accepting, without any transition, are most likely typos
+    connected_states = set(transition_dict)
+    connected_states.update(state_to for transitions in transition_dict.values() for _, state_to in transitions)
+    if connected_states:
+        for state in set(automaton.initial_states + automaton.accepting_states) - connected_states:
+            problems.append(f"state {state} has no transitions")
+    return problems, automaton
+
+
+def _graph_problems(automaton):
+    """Finds unreachable and dead states."""
+    problems = []
+    analysis = automaton.analysis
+    states = automaton._collect_states()
+    reachable_states = analysis.reachable_states
+    unreachable = [state for state in states if state not in reachable_states]
+    dead = [state for state in states if state in reachable_states and analysis.is_dead(state)]
+    if unreachable:
+        problems.append(f"states {unreachable} are unreachable")
+    if dead:
+        problems.append(f"states {dead} can never reach an accepting state")
+    return problems
+
+
+def _determinism_problems(automaton):
+    problems = []
+    if len(automaton.initial_states) > 1:
+        problems.append(f"deterministic level has {len(automaton.initial_states)} initial states")
+    for state, transitions in automaton.transition_dict.items():
+        symbols = [symbol for symbols, _ in transitions for symbol in symbols]
+        repeated = sorted({symbol for symbol in symbols if symbols.count(symbol) > 1})
+        if repeated:
+            problems.append(f"deterministic level has more transitions of state {state} under {repeated}")
+    return problems
+
+
+def _metrics(automaton):
+    """Difficulty metrics: sizes of the automaton, its minimal dfa and of its subset construction."""
+    compact_automaton = automaton.compact()
+    # reachable subsets are the states of the dfa before minimisation, the empty subset is the sink
+    subsets = {compact_automaton.initial_mask}
+    frontier = [compact_automaton.initial_mask]
+    shortest_word = 0 if compact_automaton.initial_mask & compact_automaton.accepting_mask else None
+    length = 0
+    while frontier:
+        length += 1
+        next_frontier = []
+        for subset in frontier:
+            for symbol in compact_automaton.alphabet:
+                new_subset = compact_automaton.step(subset, symbol)
+                if new_subset not in subsets:
+                    subsets.add(new_subset)
+                    next_frontier.append(new_subset)
+                    if shortest_word is None and new_subset & compact_automaton.accepting_mask:
+                        shortest_word = length
+        frontier = next_frontier
+
+    state_count = compact_automaton.state_count
+    _, accepting, _ = compact_automaton.canonical_form()
+    return {"states": state_count,
+            "transitions": sum(len(symbols) for transitions in automaton.transition_dict.values()
+                               for symbols, _ in transitions),
+            "minimal_dfa_states": len(accepting),
+            "subsets": len(subsets),
+            "blowup": len(subsets) / state_count if state_count else 0.0,
+            "shortest_word": shortest_word}
+
+
+def validate_level(task):
+    """Checks one level. Returns (section, level, problems, metrics)."""
+    section, level, level_data, completion = task
+    problems = []
+    metrics = {}
+    if completion:
+        return section, level, problems, metrics  # completion screen has no automaton to build
+
+    alphabet = Automaton(1)._alphabet
+    automata_data = []
+    if "transition_dict" in level_data:
+        automata_data.append(("", level_data))
+    for index, goal_automaton_data in enumerate(level_data.get("goal", {}).get("automata", [])):
+        automata_data.append((f"goal automaton {index}: ", goal_automaton_data))
+    if not automata_data:
+        problems.append("level has neither automaton, nor goal")
+
+    for prefix, automaton_data in automata_data:
+        automaton_problems, automaton = _automaton_problems(automaton_data, alphabet)
+        if automaton:
+            automaton_problems += _graph_problems(automaton)
+        problems += [prefix + problem for problem in automaton_problems]
+        if not automaton or prefix:
+            continue
+
+        # section 0 is the deterministic one, other levels can claim it explicitly
+        if level_data.get("deterministic", section == 0):
+            problems += _determinism_problems(automaton)
+        if "regex" in level_data:
+            try:
+                regex_automaton = automaton_from_regex(level_data["regex"])
+                if regex_automaton.canonical_form() != automaton.canonical_form():
+                    problems.append(f"regex {level_data['regex']!r} doesnt describe the language of the automaton")
+            except ValueError as error:
+                problems.append(str(error))
+        metrics = _metrics(automaton)
+    return section, level, problems, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validates levels and measures their difficulty.")
+    parser.add_argument("path", nargs="?", default="levels/levels.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    # every level is needed, so the file is parsed at once. the catalogue still decides which level is the completion
+    catalogue = LevelCatalogue(arguments.path)
+    with open(arguments.path, "r", encoding="utf-8") as file:
+        file_dict = json.load(file)
+    tasks = [(section, level, file_dict[f"section_{section}"][level - 1], catalogue.is_completion(section, level))
+             for section in catalogue.sections for level in range(1, catalogue.level_count(section) + 1)]
+    # levels are small, sending them in chunks keeps the pool busy instead of waiting on messages
+    chunk_size = max(1, len(tasks) // (arguments.workers * 4))
+    with ProcessPoolExecutor(max_workers=arguments.workers) as pool:
+        results = list(pool.map(validate_level, tasks, chunksize=chunk_size))
+
+    invalid_levels = 0
+    for section, level, problems, metrics in results:
+        line = f"section {section} level {level}: {'problems' if problems else 'ok'}"
+        if metrics:
+            line += (f"  states {metrics['states']}, transitions {metrics['transitions']},"
+                     f" minimal dfa {metrics['minimal_dfa_states']}, subsets {metrics['subsets']}"
+                     f" ({metrics['blowup']:.2f}x), shortest word {metrics['shortest_word']}")
+        print(line)
+        for problem in problems:
+            print(f"    {problem}")
+        invalid_levels += bool(problems)
+
+    print(f"{len(results)} levels, {invalid_levels} with problems, {time.perf_counter() - start:.2f} s")
+    return 1 if invalid_levels else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# run from the root of the game: python -m tools.replay_input <input log> [--repeat N]
+import argparse
+import os
+import sys
+
+# replays run without a window and without an audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from config.pygame_setup import pygame
+import game
+
+
+def _percentile(sorted_times, fraction):
+    return sorted_times[min(len(sorted_times) - 1, int(len(sorted_times) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a recorded session and measures how long its frames take.")
+    parser.add_argument("path")
+    parser.add_argument("--repeat", type=int, default=1)
+    arguments = parser.parse_args()
+
+    for run in range(1, arguments.repeat + 1):
+        replayed_game = game.Game()
+        try:
+            frame_times = replayed_game.replay(arguments.path)
+        except (OSError, ValueError) as error:
+            print(error)
+            return 1
+        replayed_game.file_handler.close()
+
+        sorted_times = sorted(frame_times) or [0.0]
+        automaton = replayed_game.automaton_var
+        print(f"run {run}: {len(frame_times)} frames, mean {sum(sorted_times) / len(sorted_times) * 1000:.2f} ms,"
+              f" p50 {_percentile(sorted_times, 0.5) * 1000:.2f} ms, p95 {_percentile(sorted_times, 0.95) * 1000:.2f} ms,"
+              f" max {sorted_times[-1] * 1000:.2f} ms")
+        print(f"    ended in section {replayed_game.level_info.section} level {replayed_game.level_info.level},"
+              f" {len(replayed_game.circle_group)} circles, initial {sorted(automaton.initial_states)},"
+              f" accepting {sorted(automaton.accepting_states)}, transitions {automaton.transition_dict}")
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
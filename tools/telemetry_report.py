@@ -0,0 +1,87 @@
+# run from the root of the game: python -m tools.telemetry_report <telemetry directory>
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def read_events(directory):
+    """Yields events of every telemetry file in the directory, lines that arent json are skipped."""
+    for path in glob.glob(os.path.join(directory, "events*.ndjson")):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # line cut off by a crash
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarises telemetry of the game, slowest levels first.")
+    parser.add_argument("directory")
+    arguments = parser.parse_args()
+
+    # (section, level) -> latencies of checks, verdicts, lengths of counter examples, frame spikes, visits
+    latencies = defaultdict(list)
+    verdicts = defaultdict(lambda: defaultdict(int))
+    counter_example_lengths = defaultdict(list)
+    spikes = defaultdict(int)
+    visits = defaultdict(int)
+    # product checks of nondeterministic automata, which were reduced before determinisation
+    reductions = []
+    for event in read_events(arguments.directory):
+        if event["event"] == "checker" and "states_before" in event:
+            reductions.append(event)
+        if "section" not in event:
+            continue  # event from before any level was entered
+        key = (event["section"], event["level"])
+        kind = event["event"]
+        if kind == "check":
+            latencies[key].append(event["latency_ms"])
+            verdicts[key][event["verdict"]] += 1
+            if "counter_example_length" in event:
+                counter_example_lengths[key].append(event["counter_example_length"])
+        elif kind == "frame_spike":
+            spikes[key] += 1
+        elif kind == "level_entered":
+            visits[key] += 1
+
+    levels = set(latencies) | set(spikes) | set(visits)
+    if not levels and not reductions:
+        print("no telemetry events")
+        return 1
+
+    def slowness(key):
+        return _percentile(sorted(latencies[key]), 0.95) if latencies[key] else 0.0
+
+    for section, level in sorted(levels, key=slowness, reverse=True):
+        key = (section, level)
+        line = f"section {section} level {level}: entered {visits[key]}x, {spikes[key]} frame spikes"
+        if latencies[key]:
+            sorted_latencies = sorted(latencies[key])
+            line += (f", {len(sorted_latencies)} checks, p50 {_percentile(sorted_latencies, 0.5):.1f} ms,"
+                     f" p95 {_percentile(sorted_latencies, 0.95):.1f} ms, max {sorted_latencies[-1]:.1f} ms, "
+                     + ", ".join(f"{verdict} {count}" for verdict, count in sorted(verdicts[key].items())))
+        if counter_example_lengths[key]:
+            lengths = counter_example_lengths[key]
+            line += f", counter examples {sum(lengths) / len(lengths):.1f} symbols on average"
+        print(line)
+
+    if reductions:
+        states_before = sum(event["states_before"] for event in reductions)
+        states_after = sum(event["states_after"] for event in reductions)
+        print(f"simulation reduction: {len(reductions)} nfas, {states_before} -> {states_after} states,"
+              f" {sum(event['reduction_seconds'] for event in reductions) * 1000:.1f} ms reducing,"
+              f" {sum(event['dfa_states'] for event in reductions)} dfa states in"
+              f" {sum(event['determinisation_seconds'] for event in reductions) * 1000:.1f} ms determinising")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+
+class VerdictCache():
+    """Serves verdicts for automata whose language was already checked against the same level."""
+
+    def __init__(self, max_verdicts=1024):
+        """Creates an empty cache with zeroed statistics, keeping at most max_verdicts verdicts."""
+        # (level signature, player signature) -> (level form, player form, verdict), least recently used first
+        self._verdicts = OrderedDict()
+        self._max_verdicts = max_verdicts
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    @property
+    def hit_rate(self):
+        checked = self.hits + self.misses
+        return self.hits / checked if checked else 0.0
+
+    def stats(self):
+        """Returns the statistics of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions,
+                "hit_rate": self.hit_rate, "languages": len(self._verdicts)}
+
+    def check(self, player_automaton, level_form, level_signature, check_language):
+        """Returns the verdict of check_language(player_automaton), from cache if the language was checked before.
+
+        level_form is the canonical form of the level, e.g. Level.language_form, and level_signature its hash."""
+        # errors are cheap to find and depend on the structure, not the language, so they are never cached
+        errors = player_automaton._handle_errors()
+        if errors:
+            return errors
+
+        player_form = player_automaton.canonical_form()
+        key = (level_signature, player_automaton.canonical_signature(player_form))
+
+        cached = self._verdicts.get(key)
+        if cached:
+            # comparing the whole forms, so a hash collision can never serve a wrong verdict
+            if cached[0] == level_form and cached[1] == player_form:
+                self.hits += 1
+                self._verdicts.move_to_end(key)
+                return cached[2]
+            self.collisions += 1
+
+        self.misses += 1
+        verdict = check_language(player_automaton)
+        self._verdicts[key] = (level_form, player_form, verdict)
+        self._verdicts.move_to_end(key)
+        if len(self._verdicts) > self._max_verdicts:
+            self._verdicts.popitem(last=False)
+        return verdict
+
+    def check_batch(self, player_automata, level_form, level_signature, check_language):
+        """Checks every automaton from the batch against the level."""
+        return [self.check(player_automaton, level_form, level_signature, check_language)
+                for player_automaton in player_automata]